@@ -1,6 +1,10 @@
 import subprocess
 import os
 
+from shorts.ass import ass_filter
+from shorts.overlays import CENTER_X, Layer
+from shorts.probe import get_duration, probe
+
 os.chdir(r"C:\sudoku\mighty_app")
 
 FONT_B = "C\\:/Windows/Fonts/arialbd.ttf"
@@ -12,100 +16,58 @@ def run_ffmpeg(cmd):
         print(f'  ERROR: {result.stderr[-500:]}')
     return result.returncode == 0
 
-def get_duration(f):
-    r = subprocess.run(
-        ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', f],
-        capture_output=True, text=True
-    )
-    return float(r.stdout.strip())
-
-def write_text(tag, idx, content):
-    fname = f"txt_{tag}_{idx:02d}.txt"
-    with open(fname, 'w', encoding='utf-8') as f:
-        f.write(content)
-    return fname
+FONTS = {'bold': FONT_B, 'regular': FONT_R}
+
+# drawtext와 같은 필드 (shorts.overlays.STYLES 형식)
+STYLES = {
+    'title':      dict(font='bold', size=80, color='#FFD700', border=5, shadow=4,
+                       box=0.6, boxborder=20, x=CENTER_X, y='(h-text_h)/2-80'),
+    'intro_sub':  dict(font='bold', size=30, color='white', border=3, shadow=3,
+                       box=0.6, boxborder=12, x=CENTER_X, y='(h-text_h)/2+10'),
+    'intro_info': dict(font='regular', size=26, color='#AADDFF', border=3, shadow=2,
+                       box=0.6, boxborder=10, x=CENTER_X, y='(h-text_h)/2+60'),
+    'phase':      dict(font='bold', size=44, color='#FFD700', border=4, shadow=3,
+                       box=0.7, boxborder=14, x=CENTER_X, y='6'),
+    'phase_sub':  dict(font='bold', size=26, color='white', border=3, shadow=2,
+                       box=0.6, boxborder=8, x=CENTER_X, y='62'),
+    'cta':        dict(font='bold', size=34, color='white', border=4, shadow=3,
+                       box=0.7, boxborder=14, x=CENTER_X, y='h-200'),
+    'cta_store':  dict(font='bold', size=28, color='#34A853', border=3, shadow=3,
+                       box=0.7, boxborder=12, x=CENTER_X, y='h-140'),
+}
 
 def process_video(input_file, output_file, tag, game_info, phases):
-    dur = get_duration(input_file)
+    info = probe(input_file)
+    dur = info.duration
     print(f'\n=== {input_file} ({dur:.1f}s) => {output_file} ===')
 
-    idx = [0]
-    def txt(content):
-        idx[0] += 1
-        return write_text(tag, idx[0], content)
-
-    filters = []
-
     # --- Intro title (0~3s) - centered on screen, large & bold ---
-    tf = txt("MIGHTY")
-    filters.append(
-        f"drawtext=fontfile='{FONT_B}':textfile='{tf}':fontsize=80:fontcolor=#FFD700"
-        f":borderw=5:bordercolor=black:shadowcolor=black@0.9:shadowx=4:shadowy=4"
-        f":box=1:boxcolor=black@0.6:boxborderw=20"
-        f":x=(w-text_w)/2:y=(h-text_h)/2-80:enable='between(t,0,3)'"
-    )
-    tf = txt("Korean Card Game - AI Demo")
-    filters.append(
-        f"drawtext=fontfile='{FONT_B}':textfile='{tf}':fontsize=30:fontcolor=white"
-        f":borderw=3:bordercolor=black:shadowcolor=black@0.9:shadowx=3:shadowy=3"
-        f":box=1:boxcolor=black@0.6:boxborderw=12"
-        f":x=(w-text_w)/2:y=(h-text_h)/2+10:enable='between(t,0.5,3)'"
-    )
-    tf = txt(game_info)
-    filters.append(
-        f"drawtext=fontfile='{FONT_R}':textfile='{tf}':fontsize=26:fontcolor=#AADDFF"
-        f":borderw=3:bordercolor=black:shadowcolor=black@0.9:shadowx=2:shadowy=2"
-        f":box=1:boxcolor=black@0.6:boxborderw=10"
-        f":x=(w-text_w)/2:y=(h-text_h)/2+60:enable='between(t,1,4)'"
-    )
+    layers = [
+        Layer("MIGHTY", 'title', 0, 3),
+        Layer("Korean Card Game - AI Demo", 'intro_sub', 0.5, 3),
+        Layer(game_info, 'intro_info', 1, 4),
+    ]
 
     # --- Phase labels (top banner area, large & visible) ---
     for (start, end, label, sublabel) in phases:
         e = end if end is not None else dur
-        tf = txt(label)
-        filters.append(
-            f"drawtext=fontfile='{FONT_B}':textfile='{tf}':fontsize=44:fontcolor=#FFD700"
-            f":borderw=4:bordercolor=black:shadowcolor=black@0.9:shadowx=3:shadowy=3"
-            f":box=1:boxcolor=black@0.7:boxborderw=14"
-            f":x=(w-text_w)/2:y=6:enable='between(t,{start},{e:.1f})'"
-        )
+        layers.append(Layer(label, 'phase', start, e))
         if sublabel:
-            tf = txt(sublabel)
-            filters.append(
-                f"drawtext=fontfile='{FONT_B}':textfile='{tf}':fontsize=26:fontcolor=white"
-                f":borderw=3:bordercolor=black:shadowcolor=black@0.9:shadowx=2:shadowy=2"
-                f":box=1:boxcolor=black@0.6:boxborderw=8"
-                f":x=(w-text_w)/2:y=62:enable='between(t,{start},{e:.1f})'"
-            )
+            layers.append(Layer(sublabel, 'phase_sub', start, e))
 
     # --- Ending CTA (last 5s) ---
     cta_start = dur - 5
-    tf = txt("Mighty Card Game")
-    filters.append(
-        f"drawtext=fontfile='{FONT_B}':textfile='{tf}':fontsize=34:fontcolor=white"
-        f":borderw=4:bordercolor=black:shadowcolor=black@0.9:shadowx=3:shadowy=3"
-        f":box=1:boxcolor=black@0.7:boxborderw=14"
-        f":x=(w-text_w)/2:y=h-200:enable='between(t,{cta_start:.1f},{dur:.1f})'"
-    )
-    tf = txt("Download on Google Play")
-    filters.append(
-        f"drawtext=fontfile='{FONT_B}':textfile='{tf}':fontsize=28:fontcolor=#34A853"
-        f":borderw=3:bordercolor=black:shadowcolor=black@0.9:shadowx=3:shadowy=3"
-        f":box=1:boxcolor=black@0.7:boxborderw=12"
-        f":x=(w-text_w)/2:y=h-140:enable='between(t,{cta_start:.1f},{dur:.1f})'"
-    )
-
-    # Write filter script
-    filter_script = ",\n".join(filters)
-    script_name = f"filter_{tag}.txt"
-    with open(script_name, 'w', encoding='utf-8') as f:
-        f.write(filter_script)
-    print(f'  Filter: {script_name} ({len(filters)} drawtext layers)')
+    layers.append(Layer("Mighty Card Game", 'cta', cta_start, dur))
+    layers.append(Layer("Download on Google Play", 'cta_store', cta_start, dur))
+
+    # 모든 레이어를 ASS 스크립트 하나로 (필터 하나)
+    vf = ass_filter(layers, FONTS, STYLES, (info.width, info.height))
+    print(f'  Overlays: {len(layers)} layers in one ass filter')
 
     # Run ffmpeg
     cmd = [
         'ffmpeg', '-y', '-i', input_file,
-        '-filter_script:v', script_name,
+        '-vf', vf,
         '-c:v', 'libx264', '-preset', 'medium', '-crf', '20',
         '-c:a', 'copy',
         output_file
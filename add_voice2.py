@@ -1,31 +1,28 @@
-import edge_tts, asyncio, subprocess, os
+import asyncio, os
+
+from shorts.loudness import BACKGROUND_LUFS, gain, measure, narration_gains
+from shorts.mixer import mix_to_wav
+from shorts.probe import get_duration
+from shorts.proc import run_ffmpeg
+from shorts.tts import TtsLine, synthesize_all
+from shorts.workspace import Workspace, publish_output
 
 os.chdir(r"C:\sudoku\mighty_app")
 VOICE = "en-US-AnaNeural"
 
-def run_ffmpeg(cmd):
-    result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
-    if result.returncode != 0:
-        print(f'  ERROR: {result.stderr[-500:]}')
-    return result.returncode == 0
-
-def get_duration(f):
-    r = subprocess.run(
-        ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', f],
-        capture_output=True, text=True
-    )
-    return float(r.stdout.strip())
-
-async def generate_tts(text, output_file, rate="+0%"):
-    communicate = edge_tts.Communicate(text, VOICE, rate=rate)
-    await communicate.save(output_file)
-    dur = get_duration(output_file)
-    print(f'  TTS: ({dur:.1f}s) {text}')
-    return dur
+async def generate_tts(items):
+    """items: [(text, output_file, rate)] -> durations, synthesized concurrently (cached)."""
+    results = await synthesize_all([TtsLine(text, f, VOICE, rate) for text, f, rate in items])
+    for (text, _, _), r in zip(items, results):
+        print(f'  TTS: ({r.duration:.1f}s{", cached" if r.cached else ""}) {text}')
+    return [r.duration for r in results]
 
 async def main():
     print("=== shorts_eng2 with AnaNeural (cute girl voice) ===")
+    with Workspace("eng2_ana") as ws:
+        await voice_video(ws)
 
+async def voice_video(ws):
     narrations = [
         (0,     "Mighty! Where hidden alliances decide everything.", "+5%"),
         (5000,  "Alex bids fourteen clubs and picks a secret friend.", "+15%"),
@@ -37,34 +34,26 @@ async def main():
         (44000, "Declarer wins! Minus eighteen for the defense.", "+10%"),
     ]
 
-    narr_files = []
-    for i, (delay_ms, text, rate) in enumerate(narrations):
-        nf = f"narration/eng2_{i}.mp3"
-        await generate_tts(text, nf, rate)
-        narr_files.append((delay_ms, nf))
-
-    inputs = ["-i", "shorts_eng2.mp4"]
-    for _, nf in narr_files:
-        inputs.extend(["-i", nf])
-
-    filter_parts = ["[0:a]volume=0.3[bg]"]
-    mix_labels = "[bg]"
-    for i, (delay_ms, _) in enumerate(narr_files):
-        filter_parts.append(f"[{i+1}:a]adelay={delay_ms}|{delay_ms},volume=1.5[n{i}]")
-        mix_labels += f"[n{i}]"
-
-    n = len(narr_files) + 1
-    filter_parts.append(f"{mix_labels}amix=inputs={n}:duration=first:normalize=0[aout]")
-
-    cmd = ["ffmpeg", "-y"] + inputs + [
-        "-filter_complex", ";".join(filter_parts),
-        "-map", "0:v", "-map", "[aout]",
-        "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
-        "shorts_eng2_voice.mp4"
-    ]
+    narr_files = [(delay_ms, ws.path(f"eng2_{i}.mp3"))
+                  for i, (delay_ms, _, _) in enumerate(narrations)]
+    await generate_tts([(text, nf, rate)
+                        for (_, text, rate), (_, nf) in zip(narrations, narr_files)])
 
     print("  Mixing audio...")
-    if run_ffmpeg(cmd):
+    stem = ws.path("eng2_mix.wav")
+    def mix():
+        mix_to_wav(stem, [(delay_ms / 1000, nf) for delay_ms, nf in narr_files],
+                   background="shorts_eng2.mp4",
+                   bg_volume=gain(measure("shorts_eng2.mp4"), BACKGROUND_LUFS),
+                   narr_volume=narration_gains([nf for _, nf in narr_files]))
+    await asyncio.to_thread(mix)
+
+    def mux(out):
+        return run_ffmpeg(["ffmpeg", "-y", "-i", "shorts_eng2.mp4", "-i", stem,
+                           "-map", "0:v", "-map", "1:a",
+                           "-c:v", "copy", "-c:a", "aac", "-b:a", "128k", out])
+
+    if await publish_output("shorts_eng2_voice.mp4", mux):
         dur = get_duration("shorts_eng2_voice.mp4")
         print(f"  => shorts_eng2_voice.mp4: {dur:.1f}s")
 
@@ -3,12 +3,21 @@
 - TTS 자연 속도에 맞춰 영상 길이를 자동 확장 (정지 화면 복제)
 - 자막과 음성을 합성
 """
-import subprocess
 import asyncio
-import edge_tts
-import json
 import os
 
+from shorts.batch import ffmpeg_threads, run_batch
+from shorts.frames import extract_frames
+from shorts.holds import hold_command
+from shorts.loudness import narration_gains
+from shorts.mixer import mix_to_wav
+from shorts.overlays import filter_path
+from shorts.pipes import PIPE_OUTPUT, run_piped
+from shorts.probe import get_duration
+from shorts.timeline import Timeline
+from shorts.tts import TtsLine, synthesize_all
+from shorts.workspace import Workspace, publish_output
+
 VOICE = "ko-KR-SunHiNeural"  # 여성 한국어 음성
 OUTPUT_DIR = "C:/sudoku/mighty_app"
 
@@ -147,218 +156,153 @@ def generate_srt(segments, filename):
     print(f"Generated: {filename}")
 
 
-async def generate_tts_segments(segments, prefix):
-    """각 세그먼트별 TTS 음성 파일 생성 (자연 속도)"""
+async def generate_tts_segments(segments, ws, prefix):
+    """각 세그먼트별 TTS 음성 파일 생성 (자연 속도, 동시 요청, 캐시 사용) - 작업 폴더 ws에"""
+    lines = [
+        TtsLine(voice_text, ws.path(f"{prefix}_voice_{i:03d}.mp3"), VOICE, "+0%")
+        for i, (_, _, _, voice_text) in enumerate(segments)
+    ]
+    results = await synthesize_all(lines)
     files = []
-    for i, (start, end, _, voice_text) in enumerate(segments):
-        outfile = f"{OUTPUT_DIR}/{prefix}_voice_{i:03d}.mp3"
-        communicate = edge_tts.Communicate(voice_text, VOICE, rate="+0%")
-        await communicate.save(outfile)
-        files.append((start, outfile))
-        print(f"  TTS {i}: {outfile}")
+    for i, ((start, _, _, _), r) in enumerate(zip(segments, results)):
+        files.append((start, r.outfile, r.duration))
+        print(f"  TTS {i}: {r.outfile}{' (cached)' if r.cached else ''}")
     return files
 
 
-def get_duration(filepath):
-    """ffprobe로 파일 길이 조회"""
-    result = subprocess.run(
-        ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", filepath],
-        capture_output=True, text=True
-    )
-    data = json.loads(result.stdout)
-    return float(data["format"]["duration"])
-
-
 def adjust_timings(segments, tts_files):
     """TTS 길이에 맞춰 세그먼트 타이밍 조정 (영상을 늘려서 맞춤)"""
-    adjusted = []
-    current_time = 0.0
-    for i, (orig_start, orig_end, subtitle, voice_text) in enumerate(segments):
+    windows = []
+    for i, (orig_start, orig_end, _, _) in enumerate(segments):
         orig_window = orig_end - orig_start
-        tts_dur = get_duration(tts_files[i][1])
+        tts_dur = tts_files[i][2]
         # TTS 길이 + 여유 0.5초, 최소한 원래 길이 유지
         new_window = max(orig_window, tts_dur + 0.5)
-        new_end = current_time + new_window
-        adjusted.append((current_time, new_end, subtitle, voice_text))
+        windows.append((orig_start, new_window))
         if new_window > orig_window:
             print(f"  Segment {i}: {orig_window:.1f}s -> {new_window:.1f}s (TTS: {tts_dur:.1f}s, +{new_window - orig_window:.1f}s)")
         else:
             print(f"  Segment {i}: {orig_window:.1f}s (TTS: {tts_dur:.1f}s, OK)")
-        current_time = new_end
-    return adjusted
-
-
-def create_extended_video(input_video, adjusted_segments, frame_times, output_path):
-    """원본 영상에서 지정된 시점의 프레임을 추출하고 TTS 길이에 맞춰 확장"""
-    temp_files = []
-
-    for i in range(len(adjusted_segments)):
-        adj_dur = adjusted_segments[i][1] - adjusted_segments[i][0]
-
-        # 지정된 시점에서 프레임 추출
-        frame_time = frame_times[i]
-        frame_file = f"{OUTPUT_DIR}/tmp_frame_{i:03d}.png"
-        subprocess.run([
-            "ffmpeg", "-y", "-ss", str(frame_time),
-            "-i", input_video, "-vframes", "1", frame_file
-        ], capture_output=True, text=True)
-
-        # 프레임을 adj_dur 길이의 영상 클립으로 생성
-        clip_file = f"{OUTPUT_DIR}/tmp_clip_{i:03d}.mp4"
-        subprocess.run([
-            "ffmpeg", "-y", "-loop", "1", "-i", frame_file,
-            "-t", str(adj_dur),
-            "-c:v", "libx264", "-preset", "fast",
-            "-pix_fmt", "yuv420p", "-r", "24",
-            clip_file
-        ], capture_output=True, text=True)
-        temp_files.append(clip_file)
-        os.remove(frame_file)
-        print(f"  Clip {i}: {adj_dur:.1f}s from frame @{frame_time:.1f}s")
-
-    # 모든 클립 연결
-    list_file = f"{OUTPUT_DIR}/tmp_clips.txt"
-    with open(list_file, "w") as f:
-        for clip in temp_files:
-            f.write(f"file '{clip.replace(chr(92), '/')}'\n")
-
-    result = subprocess.run([
-        "ffmpeg", "-y", "-f", "concat", "-safe", "0",
-        "-i", list_file, "-c", "copy", output_path
-    ], capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"  Video concat ERROR: {result.stderr[-500:]}")
-    else:
-        dur = get_duration(output_path)
-        print(f"  Extended video: {dur:.1f}s")
-
-    # 임시 파일 정리
-    for clip in temp_files:
-        if os.path.exists(clip):
-            os.remove(clip)
-    if os.path.exists(list_file):
-        os.remove(list_file)
+    # 세그먼트마다 정지 화면으로 이어 붙인 출력 타임라인
+    timeline = Timeline.from_holds(windows)
+    return [(p.out, p.out + p.duration, subtitle, voice_text)
+            for p, (_, _, subtitle, voice_text) in zip(timeline.pieces, segments)]
+
+
+def create_extended_video(frames, adjusted_segments, frame_times, list_file):
+    """추출해 둔 프레임({시점: 이미지})을 TTS 길이에 맞춰 확장
+
+    영상을 파일로 쓰지 않고 파이프로 내보내는 ffmpeg 명령을 반환 (홀드 목록은 list_file에)
+    """
+    # 프레임 홀드 시퀀스 (한 번의 디코딩/출력)
+    holds = []
+    for i, (start, end, _, _) in enumerate(adjusted_segments):
+        holds.append((frames[frame_times[i]], end - start))
+        print(f"  Hold {i}: {end - start:.1f}s from frame @{frame_times[i]:.1f}s")
+    return hold_command(holds, list_file, PIPE_OUTPUT, fps=24)
 
 
 def merge_tts_to_audio(tts_files, adjusted_segments, total_duration, output_audio):
-    """TTS 파일들을 조정된 타이밍에 맞춰 합성 (속도 변경 없음, 겹침 없음)"""
-    inputs = []
-    delays = []
-    for i, (_, filepath) in enumerate(tts_files):
-        inputs.extend(["-i", filepath])
-        # 조정된 시작 시간 사용
-        adj_start = adjusted_segments[i][0]
-        delay_ms = int(adj_start * 1000)
-        delays.append(f"[{i}]adelay={delay_ms}|{delay_ms}[d{i}]")
-
-    mix_inputs = "".join(f"[d{i}]" for i in range(len(tts_files)))
-    n = len(tts_files)
-    filter_complex = (
-        ";".join(delays) +
-        f";{mix_inputs}amix=inputs={n}:duration=longest:dropout_transition=0,"
-        f"dynaudnorm=p=0.95:s=5[out]"
-    )
-
-    cmd = ["ffmpeg", "-y"] + inputs + [
-        "-filter_complex", filter_complex,
-        "-map", "[out]",
-        "-t", str(total_duration),
-        "-c:a", "aac", "-b:a", "128k",
-        output_audio
-    ]
+    """TTS 파일들을 조정된 타이밍에 맞춰 합성 (속도 변경 없음, 겹침 없음) → WAV"""
+    narrations = [(adjusted_segments[i][0], filepath)
+                  for i, (_, filepath, _) in enumerate(tts_files)]
     print(f"Merging TTS to: {output_audio}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"  Audio merge ERROR: {result.stderr[-500:]}")
+    try:
+        # 클립별 라우드니스를 한 번 측정해 둔 고정 게인 (dynaudnorm 대신)
+        gains = narration_gains([path for _, path in narrations])
+        mix_to_wav(output_audio, narrations, total_duration, narr_volume=gains)
+    except RuntimeError as e:
+        print(f"  Audio merge ERROR: {e}")
+        return False
+    return True
+
 
+async def create_final_video(ext_command, srt_file, tts_audio, output_video):
+    """자막 + TTS 음성을 합성한 최종 영상 생성 (확장 영상은 파이프로 받음)
 
-def create_final_video(input_video, srt_file, tts_audio, output_video):
-    """자막 + TTS 음성을 합성한 최종 영상 생성"""
+    srt_file은 절대 경로 (필터 그래프용 이스케이프는 여기서 함).
+    """
     cmd = [
         "ffmpeg", "-y",
-        "-i", input_video,
+        "-f", "nut", "-i", "pipe:0",
         "-i", tts_audio,
         "-filter_complex",
-        f"[0:v]subtitles={srt_file}:force_style='FontName=Malgun Gothic,FontSize=10,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,BackColour=&H80000000,Outline=1,Shadow=0,BorderStyle=4,Alignment=2,MarginV=50,Bold=1'[v]",
+        f"[0:v]subtitles='{filter_path(srt_file)}':force_style='FontName=Malgun Gothic,FontSize=10,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,BackColour=&H80000000,Outline=1,Shadow=0,BorderStyle=4,Alignment=2,MarginV=50,Bold=1'[v]",
         "-map", "[v]",
         "-map", "1:a",
         "-c:v", "libx264", "-preset", "fast", "-crf", "23",
         "-c:a", "aac", "-b:a", "128k",
         "-shortest",
-        output_video
-    ]
+    ] + ffmpeg_threads() + [output_video]
     print(f"Creating final video: {output_video}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"  ERROR: {result.stderr[-500:]}")
-    else:
+    ok = await run_piped(ext_command, cmd)
+    if ok:
         print(f"  Success: {output_video}")
+    return ok
 
 
-async def main():
-    # === Shorts 1 ===
-    print("=== Shorts 1 ===")
-
-    print("Generating TTS (natural speed)...")
-    tts1_files = await generate_tts_segments(shorts1_segments, "s1")
-
-    print("Adjusting timings to fit TTS...")
-    adjusted1 = adjust_timings(shorts1_segments, tts1_files)
-    total1 = adjusted1[-1][1]
-    print(f"  Total: {total1:.1f}s (original: 56s)")
-
-    srt1 = f"{OUTPUT_DIR}/bid1.srt"
-    generate_srt(adjusted1, srt1)
+# (태그, 원본 영상, 세그먼트, 프레임 시간, 원본 길이, 출력 파일)
+SHORTS = [
+    ("s1", "bid1", shorts1_segments, shorts1_frame_times, 56, "shorts1.mp4"),
+    ("s2", "bid2", shorts2_segments, shorts2_frame_times, 60, "shorts2.mp4"),
+]
 
-    print("Creating extended video (frame duplication)...")
-    ext1 = f"{OUTPUT_DIR}/bid1_ext.mp4"
-    create_extended_video(f"{OUTPUT_DIR}/bid1.mp4", adjusted1, shorts1_frame_times, ext1)
 
-    audio1 = f"{OUTPUT_DIR}/s1_voice.m4a"
-    merge_tts_to_audio(tts1_files, adjusted1, total1, audio1)
+async def make_shorts(tag, src, segments, frame_times, orig_len, out_name):
+    print(f"=== {out_name} ===")
+    # 중간 파일은 실행마다 따로 만든 작업 폴더에 (실패해도 정리됨)
+    with Workspace(tag) as ws:
+        return await _make_shorts(ws, tag, src, segments, frame_times, orig_len, out_name)
 
-    create_final_video(ext1, "bid1.srt", audio1, f"{OUTPUT_DIR}/shorts1.mp4")
 
-    # === Shorts 2 ===
-    print("\n=== Shorts 2 ===")
+async def _make_shorts(ws, tag, src, segments, frame_times, orig_len, out_name):
+    # 지정된 시점의 프레임을 한 번의 디코딩으로 추출 (캐시 사용) - TTS 요청과 동시에
+    frames = asyncio.create_task(asyncio.to_thread(
+        extract_frames, f"{OUTPUT_DIR}/{src}.mp4", frame_times[:len(segments)]))
 
     print("Generating TTS (natural speed)...")
-    tts2_files = await generate_tts_segments(shorts2_segments, "s2")
+    tts_files = await generate_tts_segments(segments, ws, tag)
 
     print("Adjusting timings to fit TTS...")
-    adjusted2 = adjust_timings(shorts2_segments, tts2_files)
-    total2 = adjusted2[-1][1]
-    print(f"  Total: {total2:.1f}s (original: 60s)")
+    adjusted = adjust_timings(segments, tts_files)
+    total = adjusted[-1][1]
+    print(f"  Total: {total:.1f}s (original: {orig_len}s)")
 
-    srt2 = f"{OUTPUT_DIR}/bid2.srt"
-    generate_srt(adjusted2, srt2)
+    # 자막도 작업 폴더에 (작업 디렉터리나 OUTPUT_DIR에 남기지 않음)
+    srt = os.path.abspath(ws.path(f"{tag}.srt"))
+    generate_srt(adjusted, srt)
 
     print("Creating extended video (frame duplication)...")
-    ext2 = f"{OUTPUT_DIR}/bid2_ext.mp4"
-    create_extended_video(f"{OUTPUT_DIR}/bid2.mp4", adjusted2, shorts2_frame_times, ext2)
+    ext_command = create_extended_video(await frames, adjusted, frame_times,
+                                        ws.path("holds.txt"))
+    audio = ws.path(f"{tag}_voice.wav")
+    if not await asyncio.to_thread(merge_tts_to_audio, tts_files, adjusted, total, audio):
+        return False
+    # 완성본은 임시 이름으로 만든 뒤 성공했을 때만 교체
+    return await publish_output(f"{OUTPUT_DIR}/{out_name}", lambda out: create_final_video(
+        ext_command, srt, audio, out))
 
-    audio2 = f"{OUTPUT_DIR}/s2_voice.m4a"
-    merge_tts_to_audio(tts2_files, adjusted2, total2, audio2)
 
-    create_final_video(ext2, "bid2.srt", audio2, f"{OUTPUT_DIR}/shorts2.mp4")
+def render_shorts(*args):
+    """Batch worker entry: one shorts in its own process."""
+    return asyncio.run(make_shorts(*args))
 
-    # 임시 파일 정리
-    print("\nCleaning up temp files...")
-    for f in os.listdir(OUTPUT_DIR):
-        if f.startswith("s1_voice_") or f.startswith("s2_voice_"):
-            os.remove(f"{OUTPUT_DIR}/{f}")
-    for tmp in [audio1, audio2, ext1, ext2]:
-        if os.path.exists(tmp):
-            os.remove(tmp)
+
+def main():
+    # Shorts 1, 2를 병렬 프로세스로 생성
+    results = run_batch([(job[-1], render_shorts, job) for job in SHORTS])
 
     print("\n=== 완료! ===")
-    for name in ["shorts1.mp4", "shorts2.mp4"]:
+    for job, ok in zip(SHORTS, results):
+        name = job[-1]
         path = f"{OUTPUT_DIR}/{name}"
-        if os.path.exists(path):
+        if ok and os.path.exists(path):
             dur = get_duration(path)
             size_mb = os.path.getsize(path) / (1024 * 1024)
             print(f"  {name}: {dur:.1f}초, {size_mb:.1f}MB")
+        else:
+            print(f"  {name}: FAILED")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
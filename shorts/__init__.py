@@ -0,0 +1 @@
+"""Shared helpers for the make_*_shorts / add_voice video scripts."""
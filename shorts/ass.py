@@ -0,0 +1,193 @@
+"""Overlay layers compiled into one ASS script, rendered by libass.
+
+compile_ass() turns a job's Layers and styles into an Advanced SubStation
+script laid out on the video's frame: each drawtext style becomes an ASS
+style with the same font, size, colour, border and shadow, plus a box
+style for the translucent background, and each layer becomes a pair of
+timed events (box, then text). ass_filter() stores the script in the
+cache by content and returns the single `ass=` filter that draws all of
+them, so a job needs no per-layer text files or filter chain, and libass
+shapes each label once and keeps its glyphs cached between frames.
+"""
+import ast
+import math
+import operator
+import os
+import struct
+
+from shorts.cache import atomic_write_text, cache_key, cache_path, is_cached
+from shorts.overlays import CENTER_X, filter_path
+
+ASS_VERSION = 1
+
+# drawtext 색 이름 중 스크립트에서 쓰는 것들
+COLOR_NAMES = {'white': 'FFFFFF', 'black': '000000', 'yellow': 'FFFF00', 'red': 'FF0000',
+               'green': '008000', 'blue': '0000FF'}
+
+STYLE_FORMAT = ('Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, '
+                'BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, '
+                'Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, '
+                'Encoding')
+EVENT_FORMAT = 'Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text'
+
+
+def unescape_font(fontfile):
+    """Filesystem path of a font given in filter syntax ("C\\:/Windows/...")."""
+    return fontfile.replace('\\:', ':')
+
+
+def _tables(data):
+    if data[:4] == b'ttcf':  # 컬렉션이면 첫 번째 폰트
+        data_off = struct.unpack_from('>I', data, 12)[0]
+    else:
+        data_off = 0
+    num = struct.unpack_from('>H', data, data_off + 4)[0]
+    tables = {}
+    for i in range(num):
+        tag, _, off, length = struct.unpack_from('>4sIII', data, data_off + 12 + 16 * i)
+        tables[tag.decode('latin-1')] = (off, length)
+    return tables
+
+
+def _family(data, off):
+    _, count, strings = struct.unpack_from('>HHH', data, off)
+    found = {}
+    for i in range(count):
+        plat, _, lang, name_id, length, s_off = struct.unpack_from('>6H', data, off + 6 + 12 * i)
+        if name_id != 1:
+            continue
+        raw = data[off + strings + s_off:off + strings + s_off + length]
+        if plat == 3:
+            found.setdefault(0 if lang == 0x409 else 1, raw.decode('utf-16-be', 'replace'))
+        elif plat == 1:
+            found.setdefault(2, raw.decode('latin-1'))
+    return found[min(found)] if found else None
+
+
+def font_info(fontfile):
+    """(family, bold, size scale) of a TrueType/OpenType font file.
+
+    The scale converts a drawtext font size (em size in pixels) into the
+    ASS Fontsize libass needs for the same glyphs: libass sizes fonts by
+    their Windows ascent + descent, not by em. Unreadable fonts fall back
+    to the file name and a scale of 1.
+    """
+    path = unescape_font(fontfile)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        tables = _tables(data)
+        upem = struct.unpack_from('>H', data, tables['head'][0] + 18)[0]
+        os2 = tables['OS/2'][0]
+        fs_selection = struct.unpack_from('>H', data, os2 + 62)[0]
+        win_ascent, win_descent = struct.unpack_from('>HH', data, os2 + 74)
+        family = _family(data, tables['name'][0]) or stem
+        return family, bool(fs_selection & 0x20), (win_ascent + win_descent) / upem
+    except (OSError, KeyError, struct.error):
+        return stem, None, 1.0
+
+
+def ass_color(color, alpha=1.0):
+    """&HAABBGGRR for a drawtext colour ('#FFD700', 'white', 'black@0.6')."""
+    color, _, a = color.partition('@')
+    if a:
+        alpha = float(a)
+    rgb = color[1:] if color.startswith('#') else COLOR_NAMES[color.lower()]
+    r, g, b = rgb[0:2], rgb[2:4], rgb[4:6]
+    return f'&H{round((1 - alpha) * 255):02X}{b}{g}{r}'.upper()
+
+
+_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+        ast.Div: operator.truediv}
+
+
+def eval_position(expr, **names):
+    """Value of a drawtext x/y expression ('(h-text_h)/2-110', 'h-260')."""
+    def ev(node):
+        if isinstance(node, ast.Expression):
+            return ev(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name) and node.id in names:
+            return names[node.id]
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+            return _OPS[type(node.op)](ev(node.left), ev(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -ev(node.operand)
+        raise ValueError(f'unsupported position expression: {expr!r}')
+    return ev(ast.parse(str(expr), mode='eval'))
+
+
+def ass_time(t):
+    cs = max(0, round(t * 100))
+    return f'{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}'
+
+
+def ass_text(text):
+    """Event text with ASS override braces and line breaks escaped."""
+    return text.replace('{', '\\{').replace('}', '\\}').replace('\n', '\\N')
+
+
+def _style_line(name, font, size, primary, outline_color, back, bold, border_style,
+                outline, shadow):
+    return (f'Style: {name},{font},{size},{primary},{primary},{outline_color},{back},'
+            f'{-1 if bold else 0},0,0,0,100,100,0,0,{border_style},{outline},{shadow},7,0,0,0,1')
+
+
+def compile_ass(layers, fonts, styles, size):
+    """ASS script text drawing layers on a width x height frame."""
+    w, h = size
+    used = list(dict.fromkeys(layer.style for layer in layers))
+    lines = ['[Script Info]', 'ScriptType: v4.00+', f'PlayResX: {w}', f'PlayResY: {h}',
+             'WrapStyle: 2', 'ScaledBorderAndShadow: yes', 'YCbCr Matrix: None', '',
+             '[V4+ Styles]', f'Format: {STYLE_FORMAT}']
+    heights = {}
+    for name in used:
+        style = styles[name]
+        family, bold, scale = font_info(fonts[style['font']])
+        if bold is None:
+            bold = style['font'] == 'bold'
+        fs = round(style['size'] * scale, 1)
+        heights[name] = fs
+        shadow = ass_color('black@0.9')
+        # 글자: 테두리 + 그림자 / 박스: BorderStyle 3, Outline이 여백
+        lines.append(_style_line(name, family, fs, ass_color(style['color']), ass_color('black'),
+                                 shadow, bold, 1, style['border'], style['shadow']))
+        lines.append(_style_line(f'{name}_box', family, fs, ass_color('black', 0.0),
+                                 ass_color('black', style['box']), ass_color('black', 0.0),
+                                 bold, 3, style['boxborder'], 0))
+    lines += ['', '[Events]', f'Format: {EVENT_FORMAT}']
+    for layer in layers:
+        style = styles[layer.style]
+        # drawtext처럼 text_h는 줄 전체 높이 (여러 줄이면 줄 수 x 줄 높이)
+        text_h = heights[layer.style] * (layer.text.count('\n') + 1)
+        y = eval_position(style['y'], w=w, h=h, W=w, H=h, text_h=text_h)
+        if style['x'] == CENTER_X:
+            pos = f'{{\\an8\\pos({w / 2:g},{y:g})}}'
+        else:
+            x = eval_position(style['x'], w=w, h=h, W=w, H=h, text_w=0)
+            pos = f'{{\\an7\\pos({x:g},{y:g})}}'
+        start, end = ass_time(layer.start), ass_time(math.ceil(layer.end * 100) / 100)
+        text = ass_text(layer.text)
+        lines.append(f'Dialogue: 0,{start},{end},{layer.style}_box,,0,0,0,,{pos}{text}')
+        lines.append(f'Dialogue: 1,{start},{end},{layer.style},,0,0,0,,{pos}{text}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_ass(script):
+    """Cached path of the script (stored once per content)."""
+    path = cache_path('ass', cache_key(ASS_VERSION, script), '.ass')
+    if not is_cached(path):
+        atomic_write_text(path, script)
+    return path
+
+
+def ass_filter(layers, fonts, styles, size):
+    """One ass= filter drawing every layer (fonts are looked up next to the font files)."""
+    path = write_ass(compile_ass(layers, fonts, styles, size))
+    fontsdir = os.path.dirname(unescape_font(next(iter(fonts.values()))))
+    opts = f"ass='{filter_path(path)}'"
+    if fontsdir:
+        opts += f":fontsdir='{filter_path(fontsdir)}'"
+    return opts
@@ -0,0 +1,170 @@
+"""Render independent shorts in parallel worker processes.
+
+allocate() splits the machine between the tasks: how many worker
+processes, how many encodes each runs at once (the 'cpu' pool of
+shorts.dag) and how many encoder / filter threads every encode gets, so
+workers x encodes x threads stays within the cores and the concurrent
+encodes within memory. Large batches get many narrow workers (x264
+scales better across processes than across threads), small ones a few
+wide workers. Each worker sees its share through SHORTS_FFMPEG_THREADS
+(plus SHORTS_FILTER_THREADS / SHORTS_ENCODE_SLOTS) and ffmpeg_threads()
+turns it into options. naive() is the unmanaged setup (one worker per
+task, ffmpeg picking its own thread counts) for comparison; describe()
+prints either. A failing task is reported and does not stop the others.
+
+Task functions must be importable (module level) and the calling script
+must be guarded by `if __name__ == '__main__':` (spawn on Windows).
+"""
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+THREADS_ENV = 'SHORTS_FFMPEG_THREADS'
+FILTER_THREADS_ENV = 'SHORTS_FILTER_THREADS'
+ENCODES_ENV = 'SHORTS_ENCODE_SLOTS'
+
+# 인코딩 하나에 줄 최소 스레드 수, 인코딩 하나의 예상 메모리 (1080x1920 x264 + 블러 그래프)
+MIN_THREADS = 2
+ENCODE_MEMORY = 1 << 30
+# 작업(프로세스) 하나 안에서 동시에 도는 인코딩 수 상한
+MAX_ENCODES = 2
+
+# threads / filter_threads 0 = ffmpeg 기본값 (코어 전부)
+Budget = namedtuple('Budget', ['workers', 'encodes', 'threads', 'filter_threads', 'cores',
+                               'memory'])
+
+
+def machine_cores():
+    """CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def total_memory():
+    """Physical memory in bytes, or None if unknown."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        pass
+    if sys.platform == 'win32':
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = ([('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong)]
+                        + [(name, ctypes.c_ulonglong)
+                           for name in ('ullTotalPhys', 'ullAvailPhys', 'ullTotalPageFile',
+                                        'ullAvailPageFile', 'ullTotalVirtual',
+                                        'ullAvailVirtual', 'ullAvailExtendedVirtual')])
+
+        stat = MemoryStatus()
+        stat.dwLength = ctypes.sizeof(stat)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat)):
+            return stat.ullTotalPhys
+    return None
+
+
+def allocate(n_tasks, workers=None, cores=None, memory=None):
+    """Budget for n_tasks (workers=None picks the count)."""
+    cores = cores or machine_cores()
+    memory = memory or total_memory()
+    slots = max(1, cores // MIN_THREADS)
+    if memory:
+        slots = max(1, min(slots, memory // ENCODE_MEMORY))
+    workers = max(1, min(n_tasks, workers or slots))
+    encodes = max(1, min(MAX_ENCODES, slots // workers))
+    threads = max(1, cores // (workers * encodes))
+    return Budget(workers, encodes, threads, max(1, threads // 2), cores, memory)
+
+
+def naive(n_tasks, workers=None, cores=None, memory=None):
+    """Unmanaged setup: one worker per task (up to workers), ffmpeg's own threading."""
+    cores = cores or machine_cores()
+    return Budget(max(1, min(n_tasks, workers or cores)), MAX_ENCODES, 0, 0, cores,
+                  memory or total_memory())
+
+
+def describe(budget):
+    threads = budget.threads or 'auto'
+    filters = budget.filter_threads or 'auto'
+    memory = f', {budget.memory / (1 << 30):.0f} GB' if budget.memory else ''
+    return (f'{budget.workers} workers x {budget.encodes} encodes x {threads} threads '
+            f'(filters {filters}) on {budget.cores} cores{memory}')
+
+
+def current():
+    """Budget of this process: its batch share, or a single task on the whole machine."""
+    if THREADS_ENV not in os.environ and ENCODES_ENV not in os.environ:
+        return allocate(1)
+    threads = int(os.environ.get(THREADS_ENV) or 0)
+    encodes = int(os.environ.get(ENCODES_ENV) or 1)
+    cores = threads * encodes if threads else machine_cores()
+    return Budget(1, encodes, threads, int(os.environ.get(FILTER_THREADS_ENV) or 0), cores,
+                  None)
+
+
+def ffmpeg_threads():
+    """Encoder and filter thread options for one encode ([] = ffmpeg's default)."""
+    budget = current()
+    if not budget.threads:
+        return []
+    return ['-threads', str(budget.threads), '-filter_threads', str(budget.filter_threads),
+            '-filter_complex_threads', str(budget.filter_threads)]
+
+
+def _budget_env(budget):
+    return {THREADS_ENV: str(budget.threads or ''),
+            FILTER_THREADS_ENV: str(budget.filter_threads or ''),
+            ENCODES_ENV: str(budget.encodes)}
+
+
+def _init_worker(env):
+    os.environ.update(env)
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def run_batch(tasks, workers=None, budget=None):
+    """Run [(label, fn, args)] and return their results in task order.
+
+    budget defaults to allocate(len(tasks), workers). A task that raises
+    (or whose worker dies) yields None.
+    """
+    if not tasks:
+        return []
+    budget = budget or allocate(len(tasks), workers)
+    env = _budget_env(budget)
+    print(f'\n[batch] {len(tasks)} tasks: {describe(budget)}')
+    if budget.workers == 1:
+        saved = {name: os.environ.get(name) for name in env}
+        os.environ.update(env)
+        results = []
+        try:
+            for label, fn, args in tasks:
+                try:
+                    results.append(fn(*args))
+                except Exception as e:
+                    print(f'  [{label}] FAILED: {e}')
+                    results.append(None)
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        return results
+
+    results = [None] * len(tasks)
+    with ProcessPoolExecutor(max_workers=budget.workers, initializer=_init_worker,
+                             initargs=(env,)) as pool:
+        futures = {pool.submit(fn, *args): i for i, (_, fn, args) in enumerate(tasks)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            label = tasks[i][0]
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                print(f'  [{label}] FAILED: {e}')
+                continue
+            print(f'  [{label}] {"done" if results[i] else "FAILED"}')
+    return results
@@ -0,0 +1,138 @@
+"""Content-addressed on-disk cache shared by the shorts scripts.
+
+Entries live under CACHE_DIR/<kind>/<key[:2]>/<key><ext>, where the key is
+a SHA-256 of the JSON-encoded inputs that determine the entry's content.
+Set SHORTS_CACHE_DIR to move the cache (default: .shorts_cache in cwd).
+
+The cache is bounded: is_cached() marks an entry as used on every hit and
+prune() deletes the least recently used entries once the cache holds more
+than SHORTS_CACHE_LIMIT_GB (default 20, 0 = no limit). A pruned entry is
+simply rebuilt the next time it is needed.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+CACHE_DIR = os.environ.get('SHORTS_CACHE_DIR', '.shorts_cache')
+CACHE_LIMIT = int(float(os.environ.get('SHORTS_CACHE_LIMIT_GB', 20)) * (1 << 30))
+
+
+def cache_key(*parts):
+    """Stable hex digest of the given JSON-serializable parts."""
+    blob = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def cache_path(kind, key, ext=''):
+    d = os.path.join(CACHE_DIR, kind, key[:2])
+    os.makedirs(d, exist_ok=True)
+    return os.path.join(d, key + ext)
+
+
+def is_cached(path):
+    """True if the cache entry at path exists; marks it as just used (see prune)."""
+    try:
+        st = os.stat(path)
+        os.utime(path, ns=(time.time_ns(), st.st_mtime_ns))
+    except OSError:
+        return False
+    return True
+
+
+def load_meta(kind, key):
+    """Return the JSON metadata stored for key, or None on a miss."""
+    path = cache_path(kind, key, '.json')
+    if not is_cached(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_meta(kind, key, meta):
+    atomic_write_text(cache_path(kind, key, '.json'),
+                       json.dumps(meta, ensure_ascii=False, indent=1))
+
+
+def file_hash(path):
+    """SHA-256 of the file's content, computed once per (path, size, mtime)."""
+    st = os.stat(path)
+    key = cache_key(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    meta = load_meta('srchash', key)
+    if meta is None:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        meta = {'sha256': h.hexdigest()}
+        save_meta('srchash', key, meta)
+    return meta['sha256']
+
+
+def store_file(kind, key, ext, src):
+    """Copy src into the cache atomically; returns the cached path."""
+    dst = cache_path(kind, key, ext)
+    tmp = tmp_name(dst)
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+    return dst
+
+
+def fetch_file(kind, key, ext, dst):
+    """Copy a cached file to dst; returns False on a miss."""
+    src = cache_path(kind, key, ext)
+    if not is_cached(src):
+        return False
+    if os.path.abspath(src) != os.path.abspath(dst):
+        shutil.copyfile(src, dst)
+    return True
+
+
+def tmp_name(path, ext='.tmp'):
+    """Unique temporary name next to path, ending in ext (ffmpeg picks formats by it)."""
+    # 프로세스/스레드가 같은 항목을 동시에 써도 임시 파일이 겹치지 않게
+    return f'{path}.{uuid.uuid4().hex[:8]}{ext}'
+
+
+def atomic_write_text(path, text):
+    """Write text to path atomically (readers never see a partial file); returns path."""
+    tmp = tmp_name(path)
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return path
+
+
+def prune(limit=CACHE_LIMIT):
+    """Delete least recently used entries until the cache fits in limit bytes.
+
+    Returns the bytes freed. Meant to run between batches: a build in
+    progress in another process may lose its temporary file.
+    """
+    if not limit or not os.path.isdir(CACHE_DIR):
+        return 0
+    entries, total = [], 0
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((max(st.st_atime_ns, st.st_mtime_ns), st.st_size, path))
+            total += st.st_size
+    freed = 0
+    for _, size, path in sorted(entries):
+        if total - freed <= limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        freed += size
+    return freed
@@ -0,0 +1,67 @@
+"""Segment clips encoded in parallel and joined without re-encoding.
+
+Clips meant to be joined are written with the same codec, pixel format,
+frame rate, timebase and audio layout (CLIP_VIDEO / CLIP_AUDIO plus a
+shared -r), so the concat demuxer can always join them with `-c copy`.
+Durations are rounded to whole frames so the joined timeline does not
+drift.
+"""
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from shorts.batch import MIN_THREADS, current
+from shorts.proc import run_sync
+
+# 동시에 인코딩할 클립 수 (상한)
+CLIP_WORKERS = 8
+CLIP_FPS = 30
+CLIP_VIDEO = ['-c:v', 'libx264', '-preset', 'fast', '-crf', '20', '-pix_fmt', 'yuv420p',
+              '-video_track_timescale', '15360']
+CLIP_AUDIO = ['-c:a', 'aac', '-b:a', '128k', '-ar', '44100', '-ac', '2']
+
+
+def snap(t, fps=CLIP_FPS):
+    """Timestamp t rounded to the nearest frame boundary."""
+    return round(t * fps) / fps
+
+
+def _run(cmd, threads):
+    try:
+        r = run_sync(cmd[:-1] + ['-threads', str(threads), cmd[-1]])
+    except subprocess.TimeoutExpired:
+        print(f'  ERROR ({os.path.basename(cmd[-1])}): timed out')
+        return False
+    if r.returncode != 0:
+        print(f'  ERROR ({os.path.basename(cmd[-1])}): {r.stderr[-300:]}')
+    return r.returncode == 0
+
+
+def encode_clips(commands, workers=CLIP_WORKERS):
+    """Run clip commands concurrently within this process's encode budget (shorts.batch)."""
+    if not commands:
+        return True
+    budget = current()
+    cores = budget.encodes * budget.threads or budget.cores
+    workers = max(1, min(len(commands), workers, cores // MIN_THREADS))
+    threads = max(1, cores // workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return all(pool.map(lambda c: _run(c, threads), commands))
+
+
+def concat_copy(clips, list_file, output, durations=None):
+    """Join uniformly encoded clips with the concat demuxer, no re-encode.
+
+    durations (seconds, one per clip) place each clip exactly that long
+    after the previous one instead of after its container duration.
+    """
+    with open(list_file, 'w', encoding='utf-8') as f:
+        for i, clip in enumerate(clips):
+            f.write(f"file '{os.path.abspath(clip).replace(chr(92), '/')}'\n")
+            if durations:
+                f.write(f"duration {durations[i]:.6f}\n")
+    r = run_sync(['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_file,
+                  '-c', 'copy', output])
+    if r.returncode != 0:
+        print(f'  Concat ERROR: {r.stderr[-300:]}')
+    return r.returncode == 0
@@ -0,0 +1,59 @@
+"""Run a short's stages as a dependency graph.
+
+Each node is a coroutine function called with the results of the nodes it
+depends on; it starts as soon as those are done rather than when the
+previous step of a script finishes. Nodes run in a pool: 'cpu' for
+encodes and other local work, 'net' for TTS requests, None for cheap
+bookkeeping. The pools are limited separately, so a slow TTS round-trip
+never holds an encode slot and vice versa, and a job's total time tends
+to its longest dependency chain instead of the sum of its steps. The
+'cpu' limit defaults to the concurrent encodes the batch budget gives
+this process (shorts.batch).
+
+A node that raises fails every node depending on it; the others still
+run. run() returns {name: result or exception}.
+"""
+import asyncio
+
+from shorts.batch import current
+
+# 작업 하나(프로세스 하나) 안에서 동시에 돌릴 네트워크 단계 수
+NET_SLOTS = 4
+
+
+class Dag:
+    def __init__(self, cpu=None, net=NET_SLOTS):
+        self._limits = {'cpu': cpu or current().encodes, 'net': net}
+        self._nodes = {}
+
+    def add(self, name, fn, deps=(), pool='cpu'):
+        """Add node name running await fn(*dep results); returns name.
+
+        Dependencies must already be in the graph, so it stays acyclic.
+        """
+        if name in self._nodes:
+            raise ValueError(f'duplicate node: {name}')
+        missing = [d for d in deps if d not in self._nodes]
+        if missing:
+            raise ValueError(f'{name}: unknown dependencies {missing}')
+        if pool is not None and pool not in self._limits:
+            raise ValueError(f'{name}: unknown pool {pool!r}')
+        self._nodes[name] = (fn, tuple(deps), pool)
+        return name
+
+    async def run(self):
+        pools = {pool: asyncio.Semaphore(n) for pool, n in self._limits.items()}
+        tasks = {}
+
+        async def node(name):
+            fn, deps, pool = self._nodes[name]
+            args = [await tasks[d] for d in deps]
+            if pool is None:
+                return await fn(*args)
+            async with pools[pool]:
+                return await fn(*args)
+
+        for name in self._nodes:
+            tasks[name] = asyncio.ensure_future(node(name))
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return dict(zip(tasks, results))
@@ -0,0 +1,708 @@
+"""Render shorts from declarative job specs.
+
+A job spec is a JSON (or YAML, if PyYAML is installed) file describing one
+short, or {"jobs": [...]} describing several. Two kinds exist:
+
+  speed  gameplay footage with optional speed segments and blur filler,
+         phase banners, intro/CTA text and timed narration (make_ja*, make_ko*)
+  hold   still frames held for each narrated subtitle (make_bidja*)
+
+Text layers are compiled into one ASS script drawn by libass; set
+"overlays": "sprite" on a job to composite cached pre-rasterized sprites,
+or "drawtext" to draw them per frame instead.
+
+The shared base is an intermediate: it is written in a mezzanine profile
+("mezzanine": "x264" lossless, "ffv1" or "crf14"; default $SHORTS_MEZZANINE
+or "x264") with PCM audio, and only the final video / audio stages use the
+delivery encoders.
+
+Usage:
+    python -m shorts.engine jobs/ja3.json jobs/ja6.json [--workdir DIR] [--jobs N] [--draft]
+                            [--plan] [--naive] [--prune]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack
+
+from shorts.ass import ass_filter
+from shorts.batch import allocate, describe, naive as naive_budget, run_batch
+from shorts.cache import cache_key, cache_path, file_hash, is_cached, prune, tmp_name
+from shorts.clips import snap
+from shorts.dag import Dag
+from shorts.frames import extract_frames
+from shorts.graph import (AAC_DRAFT, AAC_FINAL, DRAFT_BLUR, DRAFT_FPS, DRAFT_SIZE, X264_DRAFT,
+                          X264_FINAL, blur_fill_filters, mezzanine_args, narration_mix_filters,
+                          overlay_filters, render_command, speed_filters, write_graph)
+from shorts.holds import (HOLD_FPS, hold_input, hold_video_args, hold_video_filter, silence_input,
+                          vfr_filter, write_hold_list)
+from shorts.loudness import (BACKGROUND_LUFS, NARRATION_LUFS, gain, measure,
+                             narration_gains)
+from shorts.mixer import (MIX_VERSION, PCM_ARGS, available as mixer_available, mix_to_wav,
+                          read_pcm)
+from shorts.overlays import Layer, drawtext_filters, resolve_styles, scale_styles
+from shorts.probe import get_duration, probe
+from shorts.proc import run_ffmpeg
+from shorts.smartcut import smart_cut
+from shorts.sprites import rasterize_layers, sprite_filters
+from shorts.stages import publish, run_stage
+from shorts.timeline import Timeline
+from shorts.tts import TtsLine, synthesize_all
+from shorts.workspace import Workspace
+
+
+def load_spec(path):
+    """List of job dicts from a .json / .yaml spec file."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    jobs = data['jobs'] if isinstance(data, dict) and 'jobs' in data else data
+    if isinstance(jobs, dict):
+        jobs = [jobs]
+    for job in jobs:
+        for key in ('name', 'input', 'output', 'voice', 'fonts'):
+            if key not in job:
+                raise ValueError(f'{path}: job {job.get("name", "?")} is missing "{key}"')
+    return jobs
+
+
+def build_layers(job, timeline, orig_dur):
+    """Intro, phase banner and CTA layers of a speed job (output timeline)."""
+    mt, total_dur = timeline.output, timeline.duration
+    layers = []
+    intro = job.get('intro')
+    if intro:
+        t_end = mt(intro.get('end', 3))
+        layers.append(Layer(intro['title'], 'title', 0.0, t_end))
+        if intro.get('subtitle'):
+            layers.append(Layer(intro['subtitle'], 'intro_sub', mt(0.5), t_end))
+        if intro.get('info'):
+            layers.append(Layer(intro['info'], 'intro_info', mt(1),
+                                mt(intro.get('info_end', intro.get('end', 3)))))
+    for (start, end, label, sublabel) in job.get('phases', []):
+        ns, ne = mt(start), mt(end if end is not None else orig_dur)
+        layers.append(Layer(label, 'phase', ns, ne))
+        if sublabel:
+            layers.append(Layer(sublabel, 'phase_sub', ns, ne))
+    cta = job.get('cta')
+    if cta:
+        cta_start = total_dur - job.get('cta_seconds', 5)
+        layers.append(Layer(cta[0], 'cta', cta_start, total_dur))
+        if len(cta) > 1:
+            layers.append(Layer(cta[1], 'cta_store', cta_start, total_dur))
+    return layers
+
+
+async def synthesize(job, items):
+    """items: [(text, outfile, rate)] -> durations."""
+    results = await synthesize_all([TtsLine(text, f, job['voice'], rate) for text, f, rate in items])
+    for (text, _, _), r in zip(items, results):
+        print(f'  TTS: ({r.duration:.1f}s{", cached" if r.cached else ""}) {text}')
+    return [r.duration for r in results]
+
+
+def report(output):
+    final_dur = get_duration(output)
+    sz = os.path.getsize(output) / (1024 * 1024)
+    info = probe(output)
+    print(f'\n=== Done! {output} ===')
+    print(f'  Resolution: {info.width},{info.height}\n  Duration: {final_dur:.1f}s\n  Size: {sz:.1f}MB')
+
+
+def draft_job(job):
+    """Copy of job rendered as a draft next to the final output."""
+    root, ext = os.path.splitext(job['output'])
+    return dict(job, draft=True, output=f'{root}_draft{ext}')
+
+
+def encoder_args(job):
+    return (X264_DRAFT, AAC_DRAFT) if job.get('draft') else (X264_FINAL, AAC_FINAL)
+
+
+def draft_downscale(job):
+    """Filter bringing source frames down to draft height (or none)."""
+    return [f'scale=-2:{DRAFT_SIZE[1]}:flags=fast_bilinear'] if job.get('draft') else []
+
+
+def frame_size(job, size):
+    """Size job's frames are rendered at for a layout of size (drafts are DRAFT_SIZE high)."""
+    if not job.get('draft'):
+        return size
+    w, h = size
+    return 2 * round(w * DRAFT_SIZE[1] / h / 2), DRAFT_SIZE[1]
+
+
+def overlay_chains(job, layers, size, v_in, v_out, head=(), tail=()):
+    """Text layers over v_in, between head and tail filters.
+
+    size is the frame the layers are laid out on; v_in is already at
+    frame_size(job, size), so drafts draw them at their own resolution.
+    Layers are drawn by one ass filter (libass scales the script's
+    PlayRes to the frame); "overlays" in the job selects "sprite" (cached
+    sprites) or "drawtext" (per-frame drawtext) instead, with the styles
+    scaled to the frame.
+    """
+    styles = resolve_styles(job.get('styles'))
+    backend = job.get('overlays', 'ass')
+    frame = frame_size(job, size)
+    if backend != 'ass':
+        styles = scale_styles(styles, frame[1] / size[1])
+    if backend == 'sprite':
+        sprites = rasterize_layers(layers, job['fonts'], styles, frame)
+        return sprite_filters(v_in, v_out, sprites, head, tail)
+    if backend == 'drawtext':
+        filters = drawtext_filters(layers, job['fonts'], styles)
+    else:
+        filters = [ass_filter(layers, job['fonts'], styles, size)]
+    return overlay_filters(v_in, v_out, list(head) + filters + list(tail))
+
+
+def job_segments(job):
+    return [tuple(s) for s in job.get('segments', [])]
+
+
+def base_key(job):
+    """Cache key of a speed job's language-independent base video.
+
+    Jobs over the same source with the same speed segments and filler
+    (e.g. one recording localized into several languages) share it, even
+    from different copies of the recording: the source is keyed by content.
+    """
+    return cache_key(file_hash(job['input']), job_segments(job), job.get('fill', True),
+                     job.get('draft', False), mezzanine_args(job.get('mezzanine')))
+
+
+def smart_cuttable(job):
+    """True if job's base only trims the source, so render_base can smart-cut it.
+
+    Drafts are excluded: their base is scaled down to draft size.
+    """
+    return (job.get('kind', 'speed') == 'speed' and not job.get('fill', True)
+            and not job.get('draft')
+            and all(speed == 1.0 for _, _, speed in job_segments(job)))
+
+
+def plan_speed_job(job, ws):
+    """Timeline and text layers of a speed job (no rendering, no TTS).
+
+    ws is the job's Workspace for intermediates.
+    """
+    name = job['name']
+    orig_dur = get_duration(job['input'])
+    timeline = Timeline.from_segments(job_segments(job), orig_dur)
+    print(f'\n=== {name} Shorts (orig {orig_dur:.1f}s -> {timeline.duration:.1f}s) ===')
+
+    # Step 1: Text overlays
+    print(f'\n[{name} 1] Building text overlays...')
+    layers = build_layers(job, timeline, orig_dur)
+    print(f'  Layers: {len(layers)}')
+    return {'orig_dur': orig_dur, 'timeline': timeline, 'layers': layers, 'ws': ws}
+
+
+async def narrate_speed_job(job, ctx):
+    """TTS of a speed job's narration; [(start ms, path)] on the output timeline."""
+    # Step 2: TTS (timestamps mapped, 300ms gap between lines)
+    name = job['name']
+    print(f'\n[{name} 2] Generating TTS narrations...')
+    narrations = job.get('narrations', [])
+    narr_paths = [ctx['ws'].path(f"{name}_{i}.mp3") for i in range(len(narrations))]
+    tts_durs = await synthesize(job, [(text, nf, rate)
+                                      for (_, text, rate), nf in zip(narrations, narr_paths)])
+    narr_files = []
+    prev_end_ms = 0
+    starts = ctx['timeline'].outputs([sec for sec, _, _ in narrations])
+    for (sec, _, _), start, nf, tts_dur in zip(narrations, starts, narr_paths, tts_durs):
+        new_ms = max(int(start * 1000), prev_end_ms + 300)
+        narr_files.append((new_ms, nf))
+        prev_end_ms = new_ms + int(tts_dur * 1000)
+        print(f'    {sec}s -> {new_ms}ms (end {prev_end_ms}ms)')
+    return narr_files
+
+
+def base_chains(job, orig_dur, video=True, audio=True):
+    """Speed + blur filler part of the graph; returns (chains, v_label, a_label).
+
+    video / audio False leave that stream's chains out (label is then None).
+
+    Drafts drop to DRAFT_FPS and stay at draft size from there on: the
+    filler is built at DRAFT_SIZE with a cheaper blur, an unfilled video
+    is scaled down to DRAFT_SIZE's height.
+    """
+    segments = job_segments(job)
+    chains, v, a = [], '0:v' if video else None, '0:a' if audio else None
+    if segments:
+        chains += speed_filters(segments, orig_dur, v_out=v and 'vspeed', a_out=a and 'aspeed')
+        v, a = v and 'vspeed', a and 'aspeed'
+    if not video:
+        return chains, v, a
+    draft = job.get('draft')
+    if draft:
+        chains.append(f'[{v}]fps={DRAFT_FPS}[vdraft]')
+        v = 'vdraft'
+    if job.get('fill', True):
+        if draft:
+            chains += blur_fill_filters(v, 'vfill', *DRAFT_SIZE, blur=DRAFT_BLUR,
+                                        flags='fast_bilinear')
+        else:
+            chains += blur_fill_filters(v, 'vfill')
+        v = 'vfill'
+    elif draft:
+        chains.append(f'[{v}]' + ','.join(draft_downscale(job)) + '[vsmall]')
+        v = 'vsmall'
+    return chains, v, a
+
+
+async def mux(video, audio, output):
+    """Stream-copy a video-only and an audio-only stage into output."""
+    return await run_ffmpeg(['ffmpeg', '-y', '-i', video, '-i', audio, '-map', '0:v', '-map', '1:a',
+                       '-c', 'copy', '-movflags', '+faststart', output])
+
+
+async def render_stage(kind, key, ext, inputs, chains, v_out, a_out, args, script, label):
+    """Cached video-only or audio-only render of chains (see shorts.stages)."""
+    async def build(out):
+        return await run_ffmpeg(render_command(inputs, write_graph(chains, script), v_out,
+                                               a_out, out, *args))
+    return await run_stage(kind, key, ext, build, label)
+
+
+async def file_hashes(paths):
+    """file_hash() of each path, hashed in worker threads."""
+    return list(await asyncio.gather(*(asyncio.to_thread(file_hash, p) for p in paths)))
+
+
+def mix_options(job, narr_paths, background=None):
+    """mix() options from the job's "mix" settings.
+
+    Gains bring each narration clip to "narr_lufs" and the background
+    recording to "bg_lufs" (measured once, see shorts.loudness), unless
+    the job fixes "narr_volume" / "bg_volume".
+    """
+    mix = job.get('mix', {})
+    narr = mix.get('narr_volume')
+    if narr is None:
+        narr = narration_gains(narr_paths, mix.get('narr_lufs', NARRATION_LUFS))
+    bg = mix.get('bg_volume')
+    if bg is None:
+        bg = gain(measure(background), mix.get('bg_lufs', BACKGROUND_LUFS)) if background else 0.0
+    return dict(bg_volume=bg, narr_volume=narr, duck=mix.get('duck'),
+                normalize=mix.get('normalize'))
+
+
+async def narration_stage(key, narrations, opts, audio_args, label, ws, background=None,
+                          duration=None):
+    """Cached audio stage mixing narrations [(start s, path)] in Python (shorts.mixer).
+
+    The WAV stem is written to the Workspace ws. background() is a
+    coroutine returning the PCM of the track under the voice, or None.
+    """
+    async def build(out):
+        pcm = await background() if background else None
+        wav = await asyncio.to_thread(mix_to_wav, ws.path('mix.wav'), narrations, duration,
+                                      pcm, **opts)
+        ok = await run_ffmpeg(['ffmpeg', '-y', '-i', wav] + list(audio_args) + [out])
+        os.remove(wav)
+        return ok
+    return await run_stage('audio', key, '.m4a', build, label)
+
+
+async def speed_video_stage(job, ctx, base=None):
+    """Text overlay stage over the source or a rendered base; (key, path or None).
+
+    Needs only the layers, not the narration.
+    """
+    name = job['name']
+    video_args, _ = encoder_args(job)
+    if base is None:
+        print(f'\n[{name} 3] Rendering video from source...')
+        source = job['input']
+        vchains, v, _ = base_chains(job, ctx['orig_dur'], audio=False)
+    else:
+        print(f'\n[{name} 3] Rendering video over shared base...')
+        source, vchains, v = base, [], '0:v'
+    if job.get('fill', True):
+        size = (1080, 1920)
+    else:
+        info = await asyncio.to_thread(probe, job['input'])
+        size = (info.width, info.height)
+    vchains += await asyncio.to_thread(overlay_chains, job, ctx['layers'], size, v, 'vout')
+    vkey = cache_key(await asyncio.to_thread(base_key, job), base is not None, vchains,
+                     ctx['layers'], video_args)
+    return vkey, await render_stage('video', vkey, '.mp4', [source], vchains, 'vout', None,
+                                    (video_args, []), ctx['ws'].path('filter_video.txt'),
+                                    f'{name} video')
+
+
+async def speed_audio_stage(job, ctx, narr_files, base=None):
+    """Narration mix stage over the source or base audio; (key, path or None)."""
+    name = job['name']
+    _, audio_args = encoder_args(job)
+    src_key = await asyncio.to_thread(base_key, job)
+    print(f'\n[{name} 4] Mixing narration...')
+    if base is None:
+        source = job['input']
+        achains, _, a = base_chains(job, ctx['orig_dur'], video=False)
+    else:
+        source, achains, a = base, [], '0:a'
+    opts = await asyncio.to_thread(mix_options, job, [nf for _, nf in narr_files],
+                                   job['input'])
+    narr_hashes = await file_hashes([nf for _, nf in narr_files])
+    if mixer_available():
+        # 게임 소리만 ffmpeg로 (배속 적용), 나레이션은 파이썬에서 믹스
+        bg_chains = achains + [f"[{a}]anull[mixbg]"]
+        script = ctx['ws'].path('filter_audio.txt')
+        akey = cache_key(src_key, base is not None, bg_chains, narr_hashes,
+                         [ms for ms, _ in narr_files], opts, MIX_VERSION, audio_args)
+        audio = await narration_stage(
+            akey, [(ms / 1000, nf) for ms, nf in narr_files], opts, audio_args, f'{name} audio',
+            ctx['ws'], background=lambda: read_pcm(render_command([source], write_graph(bg_chains, script),
+                                                       None, 'mixbg', 'pipe:1', [], PCM_ARGS)))
+    else:
+        achains += narration_mix_filters(a, 'aout', [ms for ms, _ in narr_files],
+                                         bg_volume=opts['bg_volume'],
+                                         narr_volume=opts['narr_volume'])
+        akey = cache_key(src_key, base is not None, achains, narr_hashes, audio_args)
+        audio = await render_stage('audio', akey, '.m4a',
+                                   [source] + [nf for _, nf in narr_files], achains, None,
+                                   'aout', ([], audio_args), ctx['ws'].path('filter_audio.txt'),
+                                   f'{name} audio')
+    return akey, audio
+
+
+async def mux_stage(job, video, audio):
+    """Publish job's output from its (key, path) video and audio stages."""
+    (vkey, vpath), (akey, apath) = video, audio
+    name = job['name']
+    if not (vpath and apath and await publish(job['output'], cache_key(vkey, akey),
+                                              lambda out: mux(vpath, apath, out),
+                                              f'{name} mux')):
+        print(f'  {name} render FAILED!')
+        return False
+    await asyncio.to_thread(report, job['output'])
+    return True
+
+
+def add_speed_job(dag, job, ctx, base=None):
+    """Add a speed job's stages to dag; base names the node rendering its base video.
+
+    TTS starts right away; the overlay stage waits only for the base, the
+    narration mix for the base and the TTS. Returns the final node's name.
+    """
+    name = job['name']
+    deps = [base] if base else []
+    tts = dag.add(f'{name} tts', lambda: narrate_speed_job(job, ctx), pool='net')
+    video = dag.add(f'{name} video', lambda *b: speed_video_stage(job, ctx, *b), deps)
+    audio = dag.add(f'{name} audio', lambda narr, *b: speed_audio_stage(job, ctx, narr, *b),
+                    [tts] + deps)
+    return dag.add(f'{name} mux', lambda v, a: mux_stage(job, v, a), [video, audio])
+
+
+def dag_results(results, finals):
+    """{job name: ok} from Dag.run() results and {job name: final node}."""
+    oks = {}
+    for name, node in finals.items():
+        res = results[node]
+        if isinstance(res, Exception):
+            print(f'  {name} FAILED: {res}')
+        oks[name] = res is True
+    return oks
+
+
+def phase_boundaries(job, orig_dur):
+    """Output-timeline times where a phase banner starts or ends (0 excluded)."""
+    timeline = Timeline.from_segments(job_segments(job), orig_dur)
+    edges = [t for (start, end, _, _) in job.get('phases', [])
+             for t in (start, end if end is not None else orig_dur)]
+    times = {round(float(t), 3) for t in timeline.outputs(edges)}
+    return sorted(t for t in times if t > 0)
+
+
+async def render_base(jobs, orig_dur, key, ws):
+    """Render (or reuse) the cached speed + filler base video for key.
+
+    Intermediates go to the Workspace ws.
+
+    A base that only trims the source (no speed change, no filler, not a
+    draft; see smart_cuttable) is smart-cut: whole GOPs are stream-copied.
+    Otherwise it is rendered with keyframes forced at every phase
+    boundary, so later cuts there are free.
+    Raises RuntimeError if the render fails.
+    """
+    job = jobs[0]
+    path = cache_path('base', key, '.mkv')
+    if is_cached(path):
+        print(f'\n[base] Reusing {path}')
+        return path
+    tmp = tmp_name(path, '.mkv')
+    if smart_cuttable(job):
+        print(f'\n[base] Smart-cutting {job["input"]}...')
+        ranges = [(start, end) for start, end, _ in job_segments(job)] or [(0.0, None)]
+        if not await asyncio.to_thread(smart_cut, job['input'], ranges, tmp,
+                                       ws.path('cut', os.path.getsize(job['input'])),
+                                       mezzanine_args(job.get('mezzanine'))[1]):
+            raise RuntimeError('base smart cut failed')
+        os.replace(tmp, path)
+        return path
+
+    print(f'\n[base] Rendering shared base for {job["input"]}...')
+    chains, v, a = base_chains(job, orig_dur)
+    if v == '0:v':
+        chains.append('[0:v]null[vbase]')
+        v = 'vbase'
+    if a == '0:a':
+        chains.append('[0:a]anull[abase]')
+        a = 'abase'
+    script = write_graph(chains, ws.path('filter_base.txt'))
+    cuts = sorted({t for j in jobs for t in phase_boundaries(j, orig_dur)})
+    video, audio = mezzanine_args(job.get('mezzanine'))
+    if cuts:
+        video = video + ['-force_key_frames', ','.join(f'{t:.3f}' for t in cuts)]
+    if not await run_ffmpeg(render_command([job['input']], script, v, a, tmp, video, audio)):
+        raise RuntimeError('base render failed')
+    os.replace(tmp, path)
+    return path
+
+
+async def render_speed_job(job):
+    with Workspace(job['name']) as ws:
+        ctx = await asyncio.to_thread(plan_speed_job, job, ws)
+        dag = Dag()
+        final = add_speed_job(dag, job, ctx)
+        return dag_results(await dag.run(), {job['name']: final})[job['name']]
+
+
+async def render_speed_group(jobs):
+    """Speed jobs sharing one base: render it once, TTS and overlays as soon as they can."""
+    key = await asyncio.to_thread(base_key, jobs[0])
+    with ExitStack() as scratch:
+        base_ws = scratch.enter_context(Workspace('base'))
+        ctxs = [await asyncio.to_thread(plan_speed_job, job,
+                                        scratch.enter_context(Workspace(job['name'])))
+                for job in jobs]
+        dag = Dag()
+        base = dag.add('base', lambda: render_base(jobs, ctxs[0]['orig_dur'], key, base_ws))
+        finals = {job['name']: add_speed_job(dag, job, ctx, base)
+                  for job, ctx in zip(jobs, ctxs)}
+        return dag_results(await dag.run(), finals)
+
+
+async def hold_tts(job, ws):
+    """TTS → hold length per subtitle; the hold timeline's layers and narration delays."""
+    name = job['name']
+    print('\n[1] Generating TTS...')
+    holds = job['holds']
+    rate = job.get('rate', '+10%')
+    pad = job.get('hold_pad', 1.5)
+    narr_paths = [ws.path(f"{name}_{i}.mp3") for i in range(len(holds))]
+    tts_durs = await synthesize(job, [(tts_txt, nf, rate)
+                                      for (_, _, tts_txt, _), nf in zip(holds, narr_paths)])
+    seg_data = []
+    for i, ((src_t, sub, _, min_s), nf, td) in enumerate(zip(holds, narr_paths, tts_durs)):
+        hold = max(min_s, td + pad)
+        seg_data.append((src_t, sub, nf, hold, td))
+        print(f'    Seg{i}: frame@{src_t}s, hold={hold:.1f}s')
+    print(f'  Total: {sum(d[3] for d in seg_data):.1f}s')
+
+    offset = job.get('narr_offset', 0.3)
+    timeline = Timeline.from_holds([(d[0], d[3]) for d in seg_data])
+    layers, delays = [], []
+    for (_, sub, _, _, _), piece in zip(seg_data, timeline.pieces):
+        layers.append(Layer(sub, 'subtitle', piece.out + 0.2, piece.out + piece.duration - 0.2))
+        delays.append(int(piece.out * 1000) + int(offset * 1000))
+    return {'segs': seg_data, 'layers': layers, 'delays': delays,
+            'total': snap(timeline.duration, HOLD_FPS), 'ws': ws}
+
+
+async def hold_frames(job):
+    """Source frames the holds show (one decode, cached across runs)."""
+    print('\n[2] Extracting frames...')
+    frames = await asyncio.to_thread(extract_frames, job['input'],
+                                     [h[0] for h in job['holds']], ext='.jpg')
+    print(f'    {len(frames)} frames @ {", ".join(f"{t}s" for t in frames)}')
+    return frames
+
+
+async def hold_video_stage(job, ctx, frames):
+    """Hold sequence + subtitles in a single encode; (key, path or None)."""
+    name = job['name']
+    print('\n[3] Holds + subtitles...')
+    hold_list = ctx['ws'].path('holds.txt')
+    total = write_hold_list([(frames[d[0]], d[3]) for d in ctx['segs']], hold_list)
+    print(f'    Holds: {total:.1f}s, {len(ctx["layers"])} subtitle layers')
+    video_args, _ = encoder_args(job)
+    fps = DRAFT_FPS if job.get('draft') else HOLD_FPS
+    info = await asyncio.to_thread(probe, job['input'])
+    vchains = await asyncio.to_thread(overlay_chains, job, ctx['layers'],
+                                      (info.width, info.height), '0:v', 'vout',
+                                      head=[hold_video_filter(fps)] + draft_downscale(job),
+                                      tail=[vfr_filter(fps)])
+    vargs = video_args + hold_video_args(vfr=True)
+    with open(hold_list, encoding='utf-8') as f:
+        vkey = cache_key(f.read(), vchains, ctx['layers'], vargs)
+    return vkey, await render_stage('video', vkey, '.mp4', [hold_input(hold_list)], vchains,
+                                    'vout', None, (vargs, []), ctx['ws'].path('filter_video.txt'),
+                                    f'{name} video')
+
+
+async def hold_audio_stage(job, ctx):
+    """Narration mix over silence as long as the holds; (key, path or None)."""
+    name = job['name']
+    print('\n[4] Narration mix...')
+    _, audio_args = encoder_args(job)
+    seg_data, delays, total = ctx['segs'], ctx['delays'], ctx['total']
+    opts = await asyncio.to_thread(mix_options, job, [d[2] for d in seg_data])
+    narr_hashes = await file_hashes([d[2] for d in seg_data])
+    if mixer_available():
+        akey = cache_key(total, delays, narr_hashes, opts, MIX_VERSION, audio_args)
+        audio = await narration_stage(
+            akey, [(ms / 1000, d[2]) for ms, d in zip(delays, seg_data)], opts, audio_args,
+            f'{name} audio', ctx['ws'], duration=total)
+    else:
+        achains = narration_mix_filters('0:a', 'aout', delays, bg_volume=opts['bg_volume'],
+                                        narr_volume=opts['narr_volume'])
+        akey = cache_key(total, achains, narr_hashes, audio_args)
+        audio = await render_stage('audio', akey, '.m4a',
+                                   [silence_input(total)] + [d[2] for d in seg_data], achains,
+                                   None, 'aout', ([], audio_args),
+                                   ctx['ws'].path('filter_audio.txt'),
+                                   f'{name} audio')
+    return akey, audio
+
+
+async def render_hold_job(job):
+    """Frame extraction runs alongside the TTS; the mix waits only for the TTS."""
+    name = job['name']
+    print(f'\n=== {name} Shorts (frame holds) ===')
+    with Workspace(name) as ws:
+        dag = Dag()
+        tts = dag.add('tts', lambda: hold_tts(job, ws), pool='net')
+        frames = dag.add('frames', lambda: hold_frames(job))
+        video = dag.add('video', lambda ctx, fr: hold_video_stage(job, ctx, fr), [tts, frames])
+        audio = dag.add('audio', lambda ctx: hold_audio_stage(job, ctx), [tts])
+        final = dag.add('mux', lambda v, a: mux_stage(job, v, a), [video, audio])
+        return dag_results(await dag.run(), {name: final})[name]
+
+
+async def render_job(job):
+    """Render one job spec; returns True on success."""
+    if job.get('kind', 'speed') == 'hold':
+        return await render_hold_job(job)
+    return await render_speed_job(job)
+
+
+async def _guarded(coro, names):
+    try:
+        return await coro
+    except Exception as e:
+        print(f'  {", ".join(names)} FAILED: {e}')
+        return {name: False for name in names}
+
+
+async def _single(job):
+    return {job['name']: await render_job(job)}
+
+
+def render_unit(jobs):
+    """Render one job, or a group of jobs sharing a base video (worker entry).
+
+    A single job goes through the base path too when its base is cached
+    or its segments can be smart-cut (cheaper than trimming the source
+    with filters; without segments the source is used as it is).
+    """
+    names = [job['name'] for job in jobs]
+    job = jobs[0]
+    if len(jobs) > 1 or (job.get('kind', 'speed') == 'speed' and os.path.exists(job['input'])
+                         and ((smart_cuttable(job) and job_segments(job))
+                              or os.path.exists(cache_path('base', base_key(job), '.mkv')))):
+        return asyncio.run(_guarded(render_speed_group(jobs), names))
+    return asyncio.run(_guarded(_single(job), names))
+
+
+def batch_units(jobs):
+    """Jobs grouped into render units: speed jobs sharing a base video go together."""
+    units, groups = [], {}
+    for job in jobs:
+        if job.get('kind', 'speed') == 'speed' and os.path.exists(job['input']):
+            key = base_key(job)
+            if key not in groups:
+                groups[key] = []
+                units.append(groups[key])
+            groups[key].append(job)
+        else:
+            units.append([job])
+    return units
+
+
+def render_batch(jobs, workers=None, draft=False, naive=False):
+    """Render jobs in parallel worker processes; returns {name: ok}.
+
+    draft=True renders quick low-resolution previews (see draft_job).
+    naive=True skips the thread budget (shorts.batch.naive), for comparison.
+
+    Speed jobs that share a base video (same source, segments and filler)
+    form one unit so the heavy speed + blur render happens once per group.
+    A failing unit does not stop the rest. The cache is pruned back to its
+    size limit afterwards (shorts.cache.prune).
+    """
+    if draft:
+        jobs = [draft_job(job) for job in jobs]
+    units = batch_units(jobs)
+    tasks = [(', '.join(job['name'] for job in unit), render_unit, (unit,)) for unit in units]
+    budget = naive_budget(len(tasks), workers) if naive else None
+    results = {}
+    for unit, res in zip(units, run_batch(tasks, workers, budget)):
+        results.update(res or {job['name']: False for job in unit})
+    prune_cache()
+    return {job['name']: results[job['name']] for job in jobs}
+
+
+def prune_cache():
+    freed = prune()
+    if freed:
+        print(f'\n[cache] pruned {freed / (1 << 20):.0f}MB of least recently used entries')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render shorts from job spec files.')
+    parser.add_argument('specs', nargs='+', help='job spec files (.json / .yaml)')
+    parser.add_argument('--workdir', help='directory holding the source videos and outputs')
+    parser.add_argument('--jobs', type=int,
+                        help='parallel worker processes (default: from the core/memory budget)')
+    parser.add_argument('--draft', action='store_true',
+                        help='fast 540x960 preview renders (written as *_draft.mp4)')
+    parser.add_argument('--plan', action='store_true',
+                        help='print the resource plan (and the naive one) without rendering')
+    parser.add_argument('--naive', action='store_true',
+                        help='no thread budget: one worker per job, ffmpeg default threads')
+    parser.add_argument('--prune', action='store_true',
+                        help='only prune the cache to SHORTS_CACHE_LIMIT_GB, no rendering')
+    args = parser.parse_args(argv)
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    jobs = [job for path in args.specs for job in load_spec(os.path.abspath(path))]
+    if args.workdir:
+        os.chdir(args.workdir)
+    if args.prune:
+        prune_cache()
+        return 0
+    if args.plan:
+        n = len(batch_units(jobs))
+        print(f'{n} units\n  budget: {describe(allocate(n, args.jobs))}'
+              f'\n  naive:  {describe(naive_budget(n, args.jobs))}')
+        return 0
+    start = time.perf_counter()
+    results = render_batch(jobs, args.jobs, draft=args.draft, naive=args.naive)
+    print(f'\n=== Batch summary ({time.perf_counter() - start:.1f}s) ===')
+    for name, ok in results.items():
+        print(f'  {name}: {"OK" if ok else "FAILED"}')
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Still frames grabbed from a source video, decoded once and cached.
+
+extract_frames() takes every timestamp a script needs from one source and
+writes all missing frames in a single ffmpeg run (one decode, one output
+per timestamp). Frames are stored in the shared cache keyed by the
+source's content hash, the timestamp and the scale, so later runs and
+other specs over the same recording reuse them.
+"""
+import os
+
+from shorts.cache import cache_key, cache_path, file_hash, is_cached, tmp_name
+from shorts.proc import run_sync
+
+# 이미지 포맷별 인코더 옵션
+FRAME_ARGS = {'.png': [], '.jpg': ['-q:v', '2']}
+
+
+def frame_path(src_hash, t, scale=None, ext='.png'):
+    return cache_path('frame', cache_key(src_hash, round(float(t), 3), scale), ext)
+
+
+def extract_frames(source, times, scale=None, ext='.png'):
+    """{t: image path} for each timestamp (seconds) in times.
+
+    scale is an ffmpeg scale size ("540:-2") or None for the source size.
+    """
+    src_hash = file_hash(source)
+    frames = {t: frame_path(src_hash, t, scale, ext) for t in times}
+    missing = sorted(t for t, p in frames.items() if not is_cached(p))
+    if not missing:
+        return frames
+
+    # 가장 이른 시점으로 seek 후 한 번만 디코딩, 시점마다 출력 하나
+    t0 = float(missing[0])
+    chains = [f"[0:v]split={len(missing)}" + ''.join(f'[s{i}]' for i in range(len(missing)))]
+    outputs, tmps = [], {t: tmp_name(frames[t], ext) for t in missing}
+    for i, t in enumerate(missing):
+        vf = f"[s{i}]trim=start={float(t) - t0:.3f},setpts=PTS-STARTPTS"
+        chains.append(vf + (f",scale={scale}" if scale else '') + f"[f{i}]")
+        outputs += ['-map', f'[f{i}]', '-frames:v', '1'] + FRAME_ARGS.get(ext, []) + [tmps[t]]
+    cmd = (['ffmpeg', '-y', '-ss', f'{t0:.3f}', '-i', source,
+            '-filter_complex', ';'.join(chains)] + outputs)
+    r = run_sync(cmd)
+    if r.returncode != 0:
+        raise RuntimeError(f'frame extraction failed for {source}: {r.stderr[-300:]}')
+    for t in missing:
+        os.replace(tmps[t], frames[t])
+    return frames
@@ -0,0 +1,162 @@
+"""ffmpeg filter_complex builders for the shorts pipeline.
+
+Each helper returns a list of filter chains ("[in]filter,...[out]") so the
+speed segments, blur filler, drawtext layers and narration mix can be
+joined into a single graph: one decode and one encode per short instead
+of an intermediate MP4 per step.
+"""
+import os
+
+from shorts.batch import ffmpeg_threads
+
+# 최종 출력 인코더 설정
+X264_FINAL = ['-c:v', 'libx264', '-preset', 'medium', '-crf', '20']
+AAC_FINAL = ['-c:a', 'aac', '-b:a', '128k']
+
+# 초안(--draft) 렌더 설정: 절반 해상도, 낮은 fps, 가장 빠른 인코딩
+DRAFT_SIZE = (540, 960)
+DRAFT_FPS = 15
+DRAFT_BLUR = 4
+X264_DRAFT = ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '28', '-pix_fmt', 'yuv420p']
+AAC_DRAFT = ['-c:a', 'aac', '-b:a', '96k']
+
+# 중간 파일(메자닌) 프로필: 쓰기/읽기가 빠르고 세대 손실 없음, 오디오는 PCM
+# 배포용 인코딩은 마지막 스테이지에서 한 번만
+MEZZANINE_ENV = 'SHORTS_MEZZANINE'
+MEZZANINE_VIDEO = {
+    'x264': ['-c:v', 'libx264', '-preset', 'ultrafast', '-qp', '0', '-pix_fmt', 'yuv420p'],
+    'ffv1': ['-c:v', 'ffv1', '-level', '3', '-g', '1', '-slices', '16', '-pix_fmt', 'yuv420p'],
+    # 거의 무손실, 파일이 훨씬 작음 (디스크가 부족할 때)
+    'crf14': ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '14', '-pix_fmt', 'yuv420p'],
+}
+MEZZANINE_AUDIO = ['-c:a', 'pcm_s16le']
+
+
+def mezzanine_args(profile=None):
+    """(video args, audio args) for an intermediate file (write it as .mkv).
+
+    profile is a MEZZANINE_VIDEO key; None uses $SHORTS_MEZZANINE, else 'x264'
+    (lossless, ultrafast).
+    """
+    profile = profile or os.environ.get(MEZZANINE_ENV) or 'x264'
+    if profile not in MEZZANINE_VIDEO:
+        raise ValueError(f'unknown mezzanine profile {profile!r} '
+                         f'(one of {", ".join(MEZZANINE_VIDEO)})')
+    return MEZZANINE_VIDEO[profile], MEZZANINE_AUDIO
+
+
+def atempo_chain(speed):
+    """atempo filters for speed (atempo accepts at most 2.0 per instance)."""
+    parts = []
+    s = speed
+    while s > 2.0:
+        parts.append('atempo=2.0')
+        s /= 2.0
+    while s < 0.5:
+        parts.append('atempo=0.5')
+        s /= 0.5
+    if abs(s - 1.0) > 0.001:
+        parts.append(f'atempo={s:.4f}')
+    return parts
+
+
+def speed_filters(segments, orig_dur, v_in='0:v', a_in='0:a', v_out='vspeed', a_out='aspeed'):
+    """Trim each (start, end, speed) segment, retime it and concat the results.
+
+    end=None means "to the end of the source" (orig_dur). v_out / a_out
+    None leaves that stream out (for video-only or audio-only graphs).
+    """
+    chains, v_labels, a_labels = [], [], []
+    for i, (start, end, speed) in enumerate(segments):
+        seg_end = end if end is not None else orig_dur
+        if v_out:
+            chains.append(f"[{v_in}]trim={start}:{seg_end:.3f},"
+                          f"setpts={1.0 / speed:.4f}*(PTS-STARTPTS)[sv{i}]")
+            v_labels.append(f"[sv{i}]")
+        if a_out:
+            af = ','.join([f"atrim={start}:{seg_end:.3f}", 'asetpts=PTS-STARTPTS']
+                          + atempo_chain(speed))
+            chains.append(f"[{a_in}]{af}[sa{i}]")
+            a_labels.append(f"[sa{i}]")
+    n = len(segments)
+    if v_out:
+        chains.append("".join(v_labels) + f"concat=n={n}:v=1:a=0[{v_out}]")
+    if a_out:
+        chains.append("".join(a_labels) + f"concat=n={n}:v=0:a=1[{a_out}]")
+    return chains
+
+
+def blur_fill_filters(v_in, v_out, width=1080, height=1920, blur=12, crop=True, flags=None):
+    """Fit the video to width x height over a blurred, enlarged copy of itself.
+
+    crop=True fills the background with aspect preserved (make_ja*),
+    crop=False stretches it (speed_edit.py's original look).
+    flags sets the scaler (e.g. 'fast_bilinear' for drafts).
+    """
+    sf = f":flags={flags}" if flags else ""
+    if crop:
+        bg = (f"scale={width}:{height}:force_original_aspect_ratio=increase{sf},"
+              f"crop={width}:{height}")
+    else:
+        bg = f"scale={width}:{height}{sf}"
+    return [
+        f"[{v_in}]split[fb{v_out}][ff{v_out}]",
+        f"[fb{v_out}]{bg},boxblur={blur}:{blur}[fbb{v_out}]",
+        f"[ff{v_out}]scale=-2:{height}{sf}[ffs{v_out}]",
+        f"[fbb{v_out}][ffs{v_out}]overlay=(W-w)/2:(H-h)/2,format=yuv420p[{v_out}]",
+    ]
+
+
+def overlay_filters(v_in, v_out, layers):
+    """Apply drawtext (or any video) filters in order; layers may be empty."""
+    if not layers:
+        return [f"[{v_in}]null[{v_out}]"]
+    return [f"[{v_in}]" + ",\n".join(layers) + f"[{v_out}]"]
+
+
+def narration_mix_filters(a_in, a_out, narrations, first_input=1,
+                          bg_volume=0.3, narr_volume=1.5, duration='first'):
+    """Mix delayed narration inputs over the source audio.
+
+    narrations: [delay_ms, ...] for ffmpeg inputs first_input, first_input+1, ...
+    narr_volume is one gain for all of them or a list with one per input.
+    """
+    if not isinstance(narr_volume, (list, tuple)):
+        narr_volume = [narr_volume] * len(narrations)
+    chains = [f"[{a_in}]volume={bg_volume}[mixbg]"]
+    labels = "[mixbg]"
+    for i, (delay_ms, vol) in enumerate(zip(narrations, narr_volume)):
+        chains.append(f"[{first_input + i}:a]adelay={delay_ms}|{delay_ms},"
+                      f"volume={vol}[mixn{i}]")
+        labels += f"[mixn{i}]"
+    chains.append(f"{labels}amix=inputs={len(narrations) + 1}:duration={duration}"
+                  f":normalize=0[{a_out}]")
+    return chains
+
+
+def write_graph(chains, filename):
+    """Write chains as a -filter_complex_script file and return its name."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(";\n".join(chains))
+    return filename
+
+
+def render_command(inputs, script, v_out, a_out, output, video_args, audio_args, extra=()):
+    """Single ffmpeg invocation rendering the graph in script to output.
+
+    inputs are paths, or (input options, path) for demuxer/lavfi inputs.
+    v_out or a_out may be None for an audio-only or video-only output.
+    """
+    cmd = ['ffmpeg', '-y']
+    for f in inputs:
+        if isinstance(f, tuple):
+            cmd += list(f[0]) + ['-i', f[1]]
+        else:
+            cmd += ['-i', f]
+    cmd += ['-filter_complex_script', script]
+    for label in (v_out, a_out):
+        if label:
+            cmd += ['-map', f'[{label}]']
+    return (cmd + list(video_args) + list(audio_args) + ffmpeg_threads()
+            + list(extra) + [output])
+
@@ -0,0 +1,72 @@
+"""Still-frame hold sequences rendered in a single encode.
+
+A hold sequence is a list of (image, seconds). Instead of one looped
+clip per image plus a concat, the images go through the concat demuxer
+with per-image durations: each image decodes once and the encoder sees
+one graph. Holds are encoded with x264's stillimage tuning; with vfr=True
+identical frames are dropped (at least one kept per second), so a long
+static hold costs a handful of frames.
+"""
+import os
+
+from shorts.clips import snap
+
+HOLD_FPS = 30
+HOLD_TUNE = ['-tune', 'stillimage']
+
+
+def _entry(image):
+    return f"file '{os.path.abspath(image).replace(chr(92), '/')}'"
+
+
+def write_hold_list(holds, list_file, fps=HOLD_FPS):
+    """Concat demuxer script for [(image, seconds)]; returns the total length.
+
+    Boundaries are rounded to whole frames on the cumulative timeline.
+    """
+    lines, t = [], 0.0
+    for image, seconds in holds:
+        dur = snap(t + seconds, fps) - snap(t, fps)
+        lines.append(f"{_entry(image)}\nduration {dur:.4f}")
+        t += seconds
+    # 마지막 이미지는 한 번 더 적어야 duration이 적용됨
+    lines.append(_entry(holds[-1][0]))
+    with open(list_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return snap(t, fps)
+
+
+def hold_input(list_file):
+    """render_command input for a hold list written by write_hold_list."""
+    return (['-f', 'concat', '-safe', '0'], list_file)
+
+
+def silence_input(seconds):
+    """render_command input of stereo silence lasting seconds."""
+    return (['-f', 'lavfi', '-t', f'{seconds:.3f}'], 'anullsrc=r=44100:cl=stereo')
+
+
+def hold_video_filter(fps=HOLD_FPS):
+    """Head of the video chain for a hold input: constant frame grid."""
+    return f'fps={fps},format=yuv420p'
+
+
+def vfr_filter(fps=HOLD_FPS):
+    """Tail of the video chain: drop repeated frames, keep one per second."""
+    return f'mpdecimate=max={fps - 1}'
+
+
+def hold_video_args(vfr):
+    return HOLD_TUNE + (['-fps_mode', 'vfr'] if vfr else [])
+
+
+def hold_command(holds, list_file, output_args, fps=HOLD_FPS, vfr=False):
+    """ffmpeg command rendering [(image, seconds)] as silent video in one run.
+
+    output_args holds the encoder options and output (a file, or
+    shorts.pipes.PIPE_OUTPUT to stream into another stage).
+    """
+    write_hold_list(holds, list_file, fps)
+    vf = hold_video_filter(fps) + (',' + vfr_filter(fps) if vfr else '')
+    return (['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_file, '-vf', vf, '-an']
+            + list(output_args))
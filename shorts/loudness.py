@@ -0,0 +1,56 @@
+"""EBU R128 loudness, measured once per file and turned into mix gains.
+
+measure() runs ffmpeg's ebur128 analysis on a narration clip or source
+recording and caches the integrated loudness by the file's content hash,
+next to the TTS and probe entries. gain() converts a measurement into the
+linear factor that brings the file to a target loudness, so a mix applies
+fixed per-input gains instead of running an adaptive normalizer (dynaudnorm)
+or guessed volumes on every render.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from shorts.cache import file_hash, load_meta, save_meta
+from shorts.proc import run_sync
+
+# 목표 라우드니스 (LUFS): 나레이션은 쇼츠 기준, 게임 소리는 그보다 한참 아래
+NARRATION_LUFS = -16.0
+BACKGROUND_LUFS = -30.0
+# 이보다 조용하면 무음으로 보고 게인을 적용하지 않음
+SILENCE_LUFS = -70.0
+MEASURE_WORKERS = 8
+
+_INTEGRATED = re.compile(r'I:\s+(-?[\d.]+|-inf) LUFS')
+
+
+def measure(path):
+    """Integrated loudness of path in LUFS (None if silent), cached by content."""
+    key = file_hash(path)
+    meta = load_meta('loudness', key)
+    if meta is None:
+        r = run_sync(['ffmpeg', '-nostats', '-hide_banner', '-i', path, '-vn',
+                      '-af', 'ebur128=framelog=quiet', '-f', 'null', '-'])
+        found = _INTEGRATED.findall(r.stderr)
+        if r.returncode != 0 or not found:
+            raise RuntimeError(f'loudness analysis failed for {path}: {r.stderr[-300:]}')
+        lufs = float(found[-1])  # 마지막 값이 Summary
+        meta = {'lufs': lufs if lufs > SILENCE_LUFS else None}
+        save_meta('loudness', key, meta)
+    return meta['lufs']
+
+
+def measure_all(paths):
+    with ThreadPoolExecutor(max_workers=MEASURE_WORKERS) as pool:
+        return list(pool.map(measure, paths))
+
+
+def gain(lufs, target):
+    """Linear gain taking a file measured at lufs to target (1.0 for silence)."""
+    if lufs is None:
+        return 1.0
+    return round(10 ** ((target - lufs) / 20), 4)
+
+
+def narration_gains(paths, target=NARRATION_LUFS):
+    """Per-clip gains bringing each narration file to target."""
+    return [gain(lufs, target) for lufs in measure_all(paths)]
@@ -0,0 +1,144 @@
+"""Pure-Python duration readers for MP3 and MP4 files.
+
+TTS clips (MP3) and our intermediates (MP4) carry their duration in the
+file itself, so reading it here keeps ffprobe off the timing path.
+Both readers return None when the file cannot be parsed; callers fall back
+to ffprobe in that case.
+"""
+import os
+import struct
+
+# MPEG 오디오 헤더 테이블 (kbps / Hz)
+_BITRATES = {
+    # (mpeg1?, layer) -> bitrate index table
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _parse_frame_header(b):
+    """(frame_len, samples, sample_rate, mpeg1, mono) for a 4-byte header, or None."""
+    h = struct.unpack('>I', b)[0]
+    if h & 0xFFE00000 != 0xFFE00000:
+        return None
+    version = (h >> 19) & 3        # 3=MPEG1, 2=MPEG2, 0=MPEG2.5
+    layer = 4 - ((h >> 17) & 3)    # 1..3
+    br_idx = (h >> 12) & 0xF
+    sr_idx = (h >> 10) & 3
+    if version == 1 or layer == 4 or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][br_idx] * 1000
+    sr = _SAMPLE_RATES[version][sr_idx]
+    pad = (h >> 9) & 1
+    mono = ((h >> 6) & 3) == 3
+    if layer == 1:
+        return (12 * bitrate // sr + pad) * 4, 384, sr, mpeg1, mono
+    if layer == 3 and not mpeg1:
+        return 72 * bitrate // sr + pad, 576, sr, mpeg1, mono
+    return 144 * bitrate // sr + pad, 1152, sr, mpeg1, mono
+
+
+def mp3_duration(path):
+    """Duration of an MPEG audio file from its Xing/Info/VBRI header or frames."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    pos = 0
+    # ID3v2 태그 건너뛰기
+    while data[pos:pos + 3] == b'ID3' and len(data) >= pos + 10:
+        size = 0
+        for c in data[pos + 6:pos + 10]:
+            size = (size << 7) | (c & 0x7F)
+        pos += 10 + size + (10 if data[pos + 5] & 0x10 else 0)
+    end = len(data) - (128 if data[-128:-125] == b'TAG' else 0)
+
+    # 첫 프레임 동기화
+    while pos + 4 <= end:
+        hdr = _parse_frame_header(data[pos:pos + 4])
+        if hdr and hdr[0] > 0:
+            break
+        pos += 1
+    else:
+        return None
+
+    frame_len, samples, sr, mpeg1, mono = hdr
+    side = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    tag_at = pos + 4 + side
+    if data[tag_at:tag_at + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', data[tag_at + 4:tag_at + 8])[0]
+        if flags & 1:
+            frames = struct.unpack('>I', data[tag_at + 8:tag_at + 12])[0]
+            return frames * samples / sr
+    if data[pos + 36:pos + 40] == b'VBRI':
+        frames = struct.unpack('>I', data[pos + 50:pos + 54])[0]
+        return frames * samples / sr
+
+    # 헤더가 없으면 (CBR) 프레임을 세어 계산
+    total_samples = 0
+    while pos + 4 <= end:
+        hdr = _parse_frame_header(data[pos:pos + 4])
+        if hdr is None or hdr[0] <= 0:
+            break
+        total_samples += hdr[1]
+        pos += hdr[0]
+    return total_samples / sr if total_samples else None
+
+
+def _iter_boxes(f, start, end):
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, kind = struct.unpack('>I4s', f.read(8))
+        hdr = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            hdr = 16
+        elif size == 0:
+            size = end - pos
+        if size < hdr:
+            return
+        yield kind, pos + hdr, pos + size
+        pos += size
+
+
+def mp4_duration(path):
+    """Movie duration from the moov/mvhd box of an MP4/MOV/M4A file.
+
+    None if the box gives none (fragmented files store a duration of 0).
+    """
+    with open(path, 'rb') as f:
+        file_end = os.fstat(f.fileno()).st_size
+        for kind, body, box_end in _iter_boxes(f, 0, file_end):
+            if kind != b'moov':
+                continue
+            for sub, sub_body, _ in _iter_boxes(f, body, box_end):
+                if sub != b'mvhd':
+                    continue
+                f.seek(sub_body)
+                version = f.read(4)[0]
+                if version == 1:
+                    _, _, timescale, duration = struct.unpack('>QQIQ', f.read(28))
+                else:
+                    _, _, timescale, duration = struct.unpack('>IIII', f.read(16))
+                return duration / timescale if timescale and duration else None
+    return None
+
+
+_READERS = {'.mp3': mp3_duration, '.mp4': mp4_duration, '.m4a': mp4_duration,
+            '.mov': mp4_duration}
+
+
+def read_duration(path):
+    """Duration in seconds for MP3/MP4 files, or None if not parseable here."""
+    reader = _READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        return None
+    try:
+        return reader(path)
+    except (OSError, struct.error, IndexError):
+        return None
@@ -0,0 +1,154 @@
+"""Narration mixing in Python: one PCM stem instead of an amix graph.
+
+An adelay + amix graph decodes every narration clip as its own ffmpeg
+input and runs a filter chain per clip. mix() instead takes each clip
+decoded once (decode() caches the PCM by content) and adds it into a
+preallocated float32 buffer at its sample offset; gain, ducking of the
+game track under the voice and peak normalization are whole-array NumPy
+operations, so mix time barely grows with the number of lines.
+mix_to_wav() writes the result as a 16-bit WAV stem for ffmpeg to encode
+or mux.
+
+NumPy is optional: without it mix_to_wav() falls back to the amix graph
+(no ducking or normalization) and available() returns False.
+"""
+import os
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from shorts.cache import cache_key, cache_path, file_hash, is_cached, tmp_name
+from shorts.graph import narration_mix_filters
+from shorts.proc import default_timeout, run, run_sync
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성
+    np = None
+
+MIX_VERSION = 1
+MIX_RATE = 48000
+MIX_CHANNELS = 2
+MIX_WORKERS = 8
+# ffmpeg → 파이프로 받는 원시 PCM 형식
+PCM_ARGS = ['-f', 'f32le', '-ac', str(MIX_CHANNELS), '-ar', str(MIX_RATE)]
+
+
+def available():
+    return np is not None
+
+
+async def read_pcm(cmd):
+    """float32 (frames, channels) array from an ffmpeg command writing PCM_ARGS to stdout."""
+    r = await run(cmd, default_timeout(), stdout=True)
+    if r.returncode != 0:
+        raise RuntimeError(f'decode failed: {r.stderr[-300:]}')
+    return np.frombuffer(r.stdout, dtype='<f4').reshape(-1, MIX_CHANNELS)
+
+
+def decode(path):
+    """Audio of path at MIX_RATE (cached per file content)."""
+    pcm = cache_path('pcm', cache_key(file_hash(path), MIX_RATE, MIX_CHANNELS), '.f32')
+    if not is_cached(pcm):
+        tmp = tmp_name(pcm)
+        r = run_sync(['ffmpeg', '-y', '-i', path, '-vn'] + PCM_ARGS + [tmp])
+        if r.returncode != 0:
+            raise RuntimeError(f'decode failed for {path}: {r.stderr[-300:]}')
+        os.replace(tmp, pcm)
+    return np.fromfile(pcm, dtype='<f4').reshape(-1, MIX_CHANNELS)
+
+
+def _smooth(mask, width):
+    """Centered moving average of mask over width samples."""
+    padded = np.pad(mask, (width // 2, width - width // 2 - 1), mode='edge')
+    cs = np.concatenate(([0.0], np.cumsum(padded, dtype=np.float64)))
+    return ((cs[width:] - cs[:-width]) / width).astype(np.float32)
+
+
+def mix(length, narrations, background=None, bg_volume=0.3, narr_volume=1.5,
+        duck=None, duck_ramp=0.15, normalize=None):
+    """length frames of narration [(start seconds, pcm)] over background pcm.
+
+    narr_volume is one gain for all lines or a list with one per line
+    (e.g. shorts.loudness.narration_gains). duck: background gain factor
+    while a voice is playing (None = off), faded in and out over duck_ramp
+    seconds. normalize: peak level to scale the result to (None = only
+    clip to [-1, 1]).
+    """
+    out = np.zeros((length, MIX_CHANNELS), dtype=np.float32)
+    voiced = np.zeros(length + 1, dtype=np.int32)
+    if not isinstance(narr_volume, (list, tuple)):
+        narr_volume = [narr_volume] * len(narrations)
+    for (start, pcm), vol in zip(narrations, narr_volume):
+        i = max(0, round(start * MIX_RATE))
+        n = min(len(pcm), length - i)
+        if n <= 0:
+            continue
+        out[i:i + n] += pcm[:n] * np.float32(vol)
+        voiced[i] += 1
+        voiced[i + n] -= 1
+    if background is not None and bg_volume:
+        bg = background[:length]
+        gain = np.full(len(bg), bg_volume, dtype=np.float32)
+        if duck is not None:
+            talking = (np.cumsum(voiced[:len(bg)]) > 0).astype(np.float32)
+            gain *= 1 - (1 - duck) * _smooth(talking, max(1, round(duck_ramp * MIX_RATE)))
+        out[:len(bg)] += bg * gain[:, None]
+    if normalize:
+        peak = float(np.abs(out).max()) if length else 0.0
+        if peak > 0:
+            out *= normalize / peak
+    return np.clip(out, -1.0, 1.0, out=out)
+
+
+def write_wav(path, samples):
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(MIX_CHANNELS)
+        w.setsampwidth(2)
+        w.setframerate(MIX_RATE)
+        w.writeframes((samples * 32767).astype('<i2').tobytes())
+    return path
+
+
+def _mix_graph(output, narrations, duration, background, bg_volume, narr_volume):
+    """amix fallback used without NumPy."""
+    if background is None:
+        inputs = ['-f', 'lavfi', '-t', f'{duration:.3f}', '-i',
+                  f'anullsrc=r={MIX_RATE}:cl=stereo']
+    else:
+        inputs = ['-i', background]
+    for _, path in narrations:
+        inputs += ['-i', path]
+    chains = narration_mix_filters('0:a', 'aout', [int(s * 1000) for s, _ in narrations],
+                                   bg_volume=bg_volume, narr_volume=narr_volume)
+    cmd = (['ffmpeg', '-y'] + inputs + ['-filter_complex', ';'.join(chains), '-map', '[aout]']
+           + (['-t', f'{duration:.3f}'] if duration else [])
+           + ['-c:a', 'pcm_s16le', '-ar', str(MIX_RATE), '-ac', str(MIX_CHANNELS), output])
+    r = run_sync(cmd)
+    if r.returncode != 0:
+        raise RuntimeError(f'narration mix failed: {r.stderr[-300:]}')
+    return output
+
+
+def mix_to_wav(output, narrations, duration=None, background=None, **opts):
+    """Mix narration files [(start seconds, path)] into a WAV stem at output.
+
+    background is a file whose audio plays under the voice, or a PCM array
+    (NumPy only); duration defaults to the background's length, else to the
+    end of the last line. opts are mix()'s gain, duck and normalize options.
+    """
+    if np is None:
+        return _mix_graph(output, narrations, duration, background,
+                          opts.get('bg_volume', 0.3), opts.get('narr_volume', 1.5))
+    with ThreadPoolExecutor(max_workers=MIX_WORKERS) as pool:
+        clips = list(pool.map(decode, [path for _, path in narrations]))
+    if isinstance(background, str):
+        background = decode(background)
+    if duration is not None:
+        length = round(duration * MIX_RATE)
+    elif background is not None:
+        length = len(background)
+    else:
+        length = max((round(s * MIX_RATE) + len(c) for (s, _), c in zip(narrations, clips)),
+                     default=0)
+    starts = [s for s, _ in narrations]
+    return write_wav(output, mix(length, list(zip(starts, clips)), background, **opts))
@@ -0,0 +1,104 @@
+"""Text overlay layers and their drawtext rendering.
+
+A Layer is one piece of text shown between start and end (output time)
+in a named style. STYLES holds the looks the make_*_shorts scripts use;
+job specs can override individual fields per style. Layers render either
+as per-frame drawtext filters (here) or as cached sprites (shorts.sprites).
+"""
+import re
+from collections import namedtuple
+
+from shorts.cache import atomic_write_text, cache_key, cache_path, is_cached
+
+Layer = namedtuple('Layer', ['text', 'style', 'start', 'end'])
+
+CENTER_X = '(w-text_w)/2'
+
+# font: 'bold' | 'regular' (job spec의 fonts 항목에서 실제 경로를 찾음)
+STYLES = {
+    'title':      dict(font='bold', size=105, color='#FFD700', border=7, shadow=5,
+                       box=0.6, boxborder=26, x=CENTER_X, y='(h-text_h)/2-110'),
+    'intro_sub':  dict(font='bold', size=40, color='white', border=4, shadow=4,
+                       box=0.6, boxborder=16, x=CENTER_X, y='(h-text_h)/2+15'),
+    'intro_info': dict(font='regular', size=32, color='#AADDFF', border=4, shadow=3,
+                       box=0.6, boxborder=14, x=CENTER_X, y='(h-text_h)/2+80'),
+    'phase':      dict(font='bold', size=56, color='#FFD700', border=5, shadow=4,
+                       box=0.7, boxborder=18, x=CENTER_X, y='8'),
+    'phase_sub':  dict(font='bold', size=32, color='white', border=4, shadow=3,
+                       box=0.6, boxborder=11, x=CENTER_X, y='78'),
+    'cta':        dict(font='bold', size=44, color='white', border=5, shadow=4,
+                       box=0.7, boxborder=18, x=CENTER_X, y='h-260'),
+    'cta_store':  dict(font='bold', size=35, color='#34A853', border=4, shadow=4,
+                       box=0.7, boxborder=16, x=CENTER_X, y='h-195'),
+    'subtitle':   dict(font='bold', size=44, color='white', border=5, shadow=4,
+                       box=0.65, boxborder=22, x=CENTER_X, y='h-text_h-110'),
+}
+
+
+def resolve_styles(overrides=None):
+    """STYLES with per-style field overrides from a job spec applied."""
+    styles = {k: dict(v) for k, v in STYLES.items()}
+    for name, fields in (overrides or {}).items():
+        styles.setdefault(name, {}).update(fields)
+    return styles
+
+
+# 레이아웃 픽셀 단위인 스타일 값
+_PIXEL_FIELDS = ('size', 'border', 'shadow', 'boxborder')
+_FRAME_NAMES = re.compile(r'\b(w|h|W|H|text_w|text_h)\b')
+
+
+def scale_styles(styles, factor):
+    """styles for a frame factor times the size of the one they are laid out on.
+
+    Sizes are scaled and x/y expressions are evaluated in layout pixels
+    ('h-260' on a half-size frame becomes '0.5*((h/0.5)-260)').
+    """
+    if factor == 1:
+        return styles
+    scaled = {}
+    for name, style in styles.items():
+        style = dict(style)
+        for field in _PIXEL_FIELDS:
+            if field in style:
+                style[field] = round(style[field] * factor)
+        for field in ('x', 'y'):
+            if field in style:
+                expr = _FRAME_NAMES.sub(lambda m: f'({m.group(1)}/{factor:g})', str(style[field]))
+                style[field] = f'{factor:g}*({expr})'
+        scaled[name] = style
+    return scaled
+
+
+def filter_path(path):
+    """path quoted for use inside a filter graph (movie=, ass=)."""
+    return path.replace('\\', '/').replace(':', '\\:')
+
+
+def drawtext_options(style, fontfile, textfile):
+    """drawtext filter for style, without timing."""
+    return (
+        f"drawtext=fontfile='{fontfile}':textfile='{textfile}'"
+        f":fontsize={style['size']}:fontcolor={style['color']}"
+        f":borderw={style['border']}:bordercolor=black"
+        f":shadowcolor=black@0.9:shadowx={style['shadow']}:shadowy={style['shadow']}"
+        f":box=1:boxcolor=black@{style['box']}:boxborderw={style['boxborder']}"
+        f":x={style['x']}:y={style['y']}"
+    )
+
+
+def drawtext_filter(layer, style, fontfile, textfile):
+    return (drawtext_options(style, fontfile, textfile)
+            + f":enable='between(t,{layer.start:.2f},{layer.end:.2f})'")
+
+
+def drawtext_filters(layers, fonts, styles):
+    """drawtext filters for layers; text goes to content-addressed files in the cache."""
+    filters = []
+    for layer in layers:
+        style = styles[layer.style]
+        tf = cache_path('text', cache_key(layer.text), '.txt')
+        if not is_cached(tf):
+            atomic_write_text(tf, layer.text)
+        filters.append(drawtext_filter(layer, style, fonts[style['font']], filter_path(tf)))
+    return filters
@@ -0,0 +1,60 @@
+"""Connect two ffmpeg stages through a pipe instead of a temp file.
+
+The producer writes NUT with uncompressed video (PIPE_OUTPUT) to stdout
+and the consumer reads it with `-f nut -i pipe:0`, so both run at once:
+the second stage starts on the first frames while the first is still
+decoding, and no intermediate MP4 is encoded, written and decoded again.
+"""
+import asyncio
+import os
+
+from shorts.proc import default_timeout, kill
+
+# 파이프 중간 포맷: 무손실, 인코딩 비용 없음
+PIPE_OUTPUT = ['-c:v', 'rawvideo', '-pix_fmt', 'yuv420p', '-f', 'nut', 'pipe:1']
+
+
+async def run_piped(producer, consumer, timeout=None):
+    """Run producer | consumer (ffmpeg commands); True if both succeed.
+
+    A producer cut off because the consumer finished first (e.g. -shortest)
+    counts as success. Both processes are killed on timeout or cancellation.
+    """
+    timeout = timeout or default_timeout()
+    sub = asyncio.subprocess
+    read_fd, write_fd = os.pipe()
+    procs = []
+    try:
+        procs.append(await asyncio.create_subprocess_exec(
+            *producer, stdin=sub.DEVNULL, stdout=write_fd, stderr=sub.PIPE))
+        procs.append(await asyncio.create_subprocess_exec(
+            *consumer, stdin=read_fd, stdout=sub.DEVNULL, stderr=sub.PIPE))
+    except BaseException:
+        for p in procs:
+            await kill(p)
+        raise
+    finally:
+        # 파이프 끝은 자식들만 갖도록 (소비자가 먼저 끝나면 생산자가 SIGPIPE를 받음)
+        os.close(read_fd)
+        os.close(write_fd)
+    prod, cons = procs
+    try:
+        (_, perr), (_, cerr) = await asyncio.wait_for(
+            asyncio.gather(prod.communicate(), cons.communicate()), timeout)
+    except asyncio.TimeoutError:
+        await asyncio.gather(kill(prod), kill(cons))
+        print(f'  ERROR: pipeline timed out after {timeout:g}s')
+        return False
+    except BaseException:
+        await asyncio.shield(asyncio.gather(kill(prod), kill(cons)))
+        raise
+    prod_rc, cons_rc = prod.returncode, cons.returncode
+    prod_msg = perr.decode('utf-8', 'replace')
+    cons_msg = cerr.decode('utf-8', 'replace')
+    if prod_rc != 0 and cons_rc == 0 and ('Broken pipe' in prod_msg or prod_rc < 0):
+        prod_rc = 0
+    if prod_rc != 0:
+        print(f'  ERROR (producer): {prod_msg[-500:]}')
+    if cons_rc != 0:
+        print(f'  ERROR (consumer): {cons_msg[-500:]}')
+    return prod_rc == 0 and cons_rc == 0
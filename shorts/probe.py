@@ -0,0 +1,78 @@
+"""Memoized media probing.
+
+One ffprobe per file version: results are keyed by path + size + mtime and
+kept both in memory and in the on-disk cache, so repeated probe() calls on
+the same TTS clip or intermediate never spawn another process.
+get_duration() reads MP3/MP4 durations in-process and only falls back to
+ffprobe for other containers.
+"""
+import json
+import os
+from collections import namedtuple
+
+from shorts.cache import cache_key, load_meta, save_meta
+from shorts.mediainfo import read_duration
+from shorts.proc import run_sync
+
+MediaInfo = namedtuple('MediaInfo', ['duration', 'width', 'height', 'fps',
+                                     'vcodec', 'acodec', 'streams'])
+
+_memo = {}
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return cache_key(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def _parse_rate(rate):
+    num, _, den = (rate or '0/1').partition('/')
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _ffprobe(path):
+    r = run_sync(['ffprobe', '-v', 'quiet', '-print_format', 'json',
+                  '-show_format', '-show_streams', path], stdout=True)
+    if r.returncode != 0:
+        raise RuntimeError(f'ffprobe failed: {path}')
+    data = json.loads(r.stdout)
+    streams = [{'index': s.get('index'), 'type': s.get('codec_type'),
+                'codec': s.get('codec_name')} for s in data.get('streams', [])]
+    video = next((s for s in data.get('streams', []) if s.get('codec_type') == 'video'), {})
+    audio = next((s for s in data.get('streams', []) if s.get('codec_type') == 'audio'), {})
+    return {
+        'duration': float(data['format']['duration']),
+        'width': video.get('width'),
+        'height': video.get('height'),
+        'fps': _parse_rate(video.get('avg_frame_rate') or video.get('r_frame_rate')) or None,
+        'vcodec': video.get('codec_name'),
+        'acodec': audio.get('codec_name'),
+        'streams': streams,
+    }
+
+
+def probe(path):
+    """MediaInfo for path; probes at most once per (path, size, mtime)."""
+    key = _file_key(path)
+    info = _memo.get(key)
+    if info is None:
+        meta = load_meta('probe', key)
+        if meta is None:
+            meta = _ffprobe(path)
+            save_meta('probe', key, meta)
+        info = _memo[key] = MediaInfo(**meta)
+    return info
+
+
+def get_duration(path):
+    """Duration in seconds; parsed in-process for MP3/MP4, ffprobe otherwise."""
+    info = _memo.get(_file_key(path))
+    if info is not None:
+        return info.duration
+    dur = read_duration(path)
+    if dur is not None:
+        return dur
+    return probe(path).duration
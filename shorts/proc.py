@@ -0,0 +1,79 @@
+"""Non-blocking subprocess runner for the asyncio scripts.
+
+subprocess.run() inside a coroutine blocks the event loop for the whole
+encode, so no TTS request (or other job in the same loop) makes progress
+meanwhile. run() starts the process with asyncio.create_subprocess_exec
+and awaits it: stderr (and optionally stdout) is captured, an optional
+timeout kills a hung process, and cancelling the awaiting task kills the
+child instead of leaving it running.
+
+run_sync() is the same runner for code that is already off the event
+loop (worker threads, thread pools, command-line helpers).
+
+Set SHORTS_FFMPEG_TIMEOUT (seconds) to give every ffmpeg call a default
+timeout.
+"""
+import asyncio
+import os
+import subprocess
+from collections import namedtuple
+
+TIMEOUT_ENV = 'SHORTS_FFMPEG_TIMEOUT'
+
+ProcResult = namedtuple('ProcResult', ['returncode', 'stdout', 'stderr'])
+
+
+def default_timeout():
+    value = os.environ.get(TIMEOUT_ENV)
+    return float(value) if value else None
+
+
+async def kill(proc):
+    """Kill a started process (if still running) and reap it."""
+    if proc.returncode is None:
+        proc.kill()
+        await proc.wait()
+
+
+async def run(cmd, timeout=None, stdout=False):
+    """Run cmd without blocking the event loop; returns ProcResult.
+
+    stdout=True captures standard output as bytes (else it is discarded).
+    Raises asyncio.TimeoutError after timeout seconds (the process is
+    killed first).
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE if stdout else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE)
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except BaseException:  # 타임아웃/취소 시 자식 프로세스도 정리
+        await asyncio.shield(kill(proc))
+        raise
+    return ProcResult(proc.returncode, out, err.decode('utf-8', 'replace'))
+
+
+def run_sync(cmd, timeout=None, stdout=False):
+    """Blocking run() for worker threads; returns the same ProcResult.
+
+    timeout defaults to SHORTS_FFMPEG_TIMEOUT; raises
+    subprocess.TimeoutExpired once it passes (the process is killed first).
+    """
+    r = subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.PIPE if stdout else subprocess.DEVNULL,
+                       stderr=subprocess.PIPE, timeout=timeout or default_timeout())
+    return ProcResult(r.returncode, r.stdout, r.stderr.decode('utf-8', 'replace'))
+
+
+async def run_ffmpeg(cmd, timeout=None):
+    """Run an ffmpeg command; True on success, errors printed."""
+    timeout = timeout or default_timeout()
+    try:
+        r = await run(cmd, timeout)
+    except asyncio.TimeoutError:
+        print(f'  ERROR: timed out after {timeout:g}s: {" ".join(cmd[:6])} ...')
+        return False
+    if r.returncode != 0:
+        print(f'  ERROR: {r.stderr[-800:]}')
+    return r.returncode == 0
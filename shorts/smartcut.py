@@ -0,0 +1,194 @@
+"""Smart-render cutting: stream-copy whole GOPs, re-encode only the edges.
+
+gop_index() indexes a source's video frames (timestamps, keyframes and
+their packet numbers) and the stream's coding parameters once per file
+version (cached). plan_cut() splits a [start, end) range into the partial
+GOPs at its edges, which must be re-encoded, and the keyframe-aligned
+middle, which is copied as-is. smart_cut() runs the plan and joins the
+pieces with concat_copy().
+
+Only H.264 sources are cut this way: the edge pieces are re-encoded with
+libx264 in the source's profile, level and pixel format, keeping its
+timestamps (so variable frame rate recordings stay as they are), and
+every piece carries its own SPS/PPS in-band, so the joined stream
+decodes across the switches between copied and re-encoded GOPs. Anything
+else falls back to re-encoding the whole range.
+"""
+import json
+import os
+from bisect import bisect_left
+
+from shorts.cache import cache_key, load_meta, save_meta
+from shorts.clips import CLIP_AUDIO, concat_copy, encode_clips
+from shorts.probe import probe
+from shorts.proc import run_sync
+
+GOP_VERSION = 2
+
+# 경계 부분 재인코딩 설정 (원본과 같은 코덱, 프로파일/레벨/픽셀 포맷은 원본에서)
+EDGE_VIDEO = ['-c:v', 'libx264', '-preset', 'fast', '-crf', '18']
+# 원본 타임스탬프와 타임베이스 유지 (-r로 고정하면 VFR 녹화가 어긋남),
+# -1 = demux (ffmpeg 6은 'demux' 이름을 모름)
+EDGE_TIMING = ['-fps_mode', 'passthrough', '-enc_time_base:v', '-1']
+EPS = 0.001
+# ffprobe pts_time은 소수 6자리로 반올림됨
+PTS_TOLERANCE = 5e-7
+
+# ffprobe 프로파일 이름 -> x264 -profile
+X264_PROFILES = {'Constrained Baseline': 'baseline', 'Baseline': 'baseline', 'Main': 'main',
+                 'High': 'high', 'High 10': 'high10', 'High 4:2:2': 'high422',
+                 'High 4:4:4 Predictive': 'high444'}
+
+
+def gop_index(path):
+    """Frames of the first video stream, indexed once per file version.
+
+    {'pts': sorted frame timestamps (s), 'keyframes': sorted keyframe pts,
+    'packets': decode-order packet number of each keyframe, 'total':
+    video packet count, 'stream': codec, profile, level and pix_fmt}.
+    """
+    st = os.stat(path)
+    key = cache_key(os.path.abspath(path), st.st_size, st.st_mtime_ns, 'gop', GOP_VERSION)
+    meta = load_meta('keyframes', key)
+    if meta is None:
+        r = run_sync(['ffprobe', '-v', 'quiet', '-select_streams', 'v:0', '-of', 'json',
+                      '-show_entries', 'stream=codec_name,profile,level,pix_fmt'
+                      ':packet=pts_time,flags', path], stdout=True)
+        if r.returncode != 0:
+            raise RuntimeError(f'ffprobe failed: {path}')
+        data = json.loads(r.stdout)
+        pts, found, total = [], [], 0
+        for packet in data.get('packets', []):
+            t = packet.get('pts_time')
+            if t not in (None, '', 'N/A'):
+                pts.append(float(t))
+                if 'K' in packet.get('flags', ''):
+                    found.append((float(t), total))
+            total += 1
+        found.sort()
+        stream = (data.get('streams') or [{}])[0]
+        meta = {'pts': sorted(pts), 'keyframes': [t for t, _ in found],
+                'packets': [n for _, n in found], 'total': total,
+                'stream': {k: stream.get(k) for k in ('codec_name', 'profile', 'level',
+                                                      'pix_fmt')}}
+        save_meta('keyframes', key, meta)
+    return meta
+
+
+def keyframes(path):
+    """Sorted keyframe timestamps (seconds) of the first video stream."""
+    return gop_index(path)['keyframes']
+
+
+def plan_cut(kfs, start, end, duration):
+    """[(mode, start, end)] pieces for the range, mode 'copy' or 'encode'.
+
+    end=None means the end of the source. A piece is copied only when it
+    starts on a keyframe and ends on a keyframe (or at the end of the file).
+    """
+    end = duration if end is None else min(end, duration)
+    k_in = next((k for k in kfs if k >= start - EPS), None)
+    if end >= duration - EPS:
+        k_out = end
+    else:
+        k_out = next((k for k in reversed(kfs) if k <= end + EPS), None)
+    if k_in is None or k_out is None or k_out - k_in <= EPS:
+        return [('encode', start, end)]
+    pieces = []
+    if k_in - start > EPS:
+        pieces.append(('encode', start, k_in))
+    pieces.append(('copy', k_in, k_out))
+    if end - k_out > EPS:
+        pieces.append(('encode', k_out, end))
+    return pieces
+
+
+def plan_pieces(index, start, end, duration):
+    """plan_cut() of a gop_index() as [(mode, seek, frames, seconds)].
+
+    A copied piece starts exactly on its keyframe and holds the packets up
+    to the next one; a re-encoded piece holds the source frames whose
+    timestamps fall in its range, with its ends moved onto frame
+    timestamps, so the piece after it (of this range or the next) follows
+    without a gap or an overlapping frame whatever the frame rate.
+    """
+    packets = dict(zip(index['keyframes'], index['packets']))
+    pts = index['pts']
+    pieces = []
+    for mode, s, e in plan_cut(index['keyframes'], start, end, duration):
+        if mode == 'copy':
+            frames = packets.get(e, index['total']) - packets[s]
+        else:
+            first = bisect_left(pts, s - PTS_TOLERANCE)
+            last = bisect_left(pts, e - PTS_TOLERANCE)
+            frames = last - first
+            if frames > 0:
+                s = pts[first]
+                e = pts[last] if last < len(pts) else max(e, s)
+        if frames > 0:
+            pieces.append((mode, s, frames, e - s))
+    return pieces
+
+
+def edge_video_args(stream):
+    """libx264 options matching the source stream's profile, level and pixel format."""
+    args = list(EDGE_VIDEO) + ['-pix_fmt', stream.get('pix_fmt') or 'yuv420p']
+    profile = X264_PROFILES.get(stream.get('profile'))
+    if profile:
+        args += ['-profile:v', profile]
+    level = stream.get('level')
+    if level and level > 0:
+        args += ['-level:v', f'{level / 10:g}']
+    # 키프레임마다 SPS/PPS를 스트림에 실어 이어 붙인 뒤에도 조각별 파라미터로 디코딩
+    return args + ['-x264-params', 'repeat-headers=1']
+
+
+def _piece_command(source, mode, seek, frames, seconds, output, video, audio, has_audio=True):
+    # ffprobe의 pts_time은 소수 6자리, ffmpeg는 -ss를 스트림 타임베이스의 가장 가까운 값으로
+    # 맞추므로 .6f면 키프레임 그 자체에서 시작 (.3f는 앞 GOP까지 복사될 수 있음)
+    cmd = ['ffmpeg', '-y', '-ss', f'{seek:.6f}', '-i', source,
+           '-map', '0:v:0', '-map', '0:a:0?', '-frames:v', str(frames)]
+    if mode == 'copy':
+        # 원본 SPS/PPS도 키프레임 앞에 넣어 둠 (재인코딩 조각 뒤에 와도 디코딩되게)
+        cmd += ['-c:v', 'copy', '-bsf:v', 'h264_mp4toannexb', '-avoid_negative_ts',
+                'make_zero']
+    else:
+        cmd += list(video) + EDGE_TIMING
+    # 끝은 -t 대신 프레임 수로 (복사 스트림의 -t는 dts 기준이라 B프레임이 있으면 어긋남),
+    # 오디오는 영상과 같은 길이로 자름
+    if has_audio:
+        cmd += ['-af', f'atrim=end={seconds:.6f}'] + list(audio)
+    return cmd + [output]
+
+
+def smart_cut(source, ranges, output, tmp_dir, audio=CLIP_AUDIO):
+    """Cut [(start, end)] ranges of source into output, copying whole GOPs.
+
+    Returns True on success. Pieces are encoded in parallel and joined
+    without re-encoding; audio is the pieces' audio codec options (e.g.
+    PCM for an intermediate, so the audio is encoded only once later).
+    """
+    info = probe(source)
+    has_audio = info.acodec is not None
+    index = gop_index(source)
+    if index['stream']['codec_name'] != 'h264':
+        index = dict(index, keyframes=[], packets=[])
+    video = edge_video_args(index['stream'])
+    os.makedirs(tmp_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(output))[0]
+    pieces, commands, durations = [], [], []
+    for start, end in ranges:
+        for mode, seek, frames, seconds in plan_pieces(index, start, end, info.duration):
+            piece = os.path.join(tmp_dir, f'{base}_cut{len(pieces):03d}.mkv')
+            print(f'    {mode:6s} {seek:7.3f}s +{seconds:.3f}s ({frames} frames)')
+            commands.append(_piece_command(source, mode, seek, frames, seconds, piece, video,
+                                           audio, has_audio))
+            pieces.append(piece)
+            durations.append(seconds)
+    # 조각 길이는 컨테이너 길이 대신 프레임 경계로 (B프레임 조각은 컨테이너 길이가 어긋남)
+    ok = encode_clips(commands) and concat_copy(pieces, os.path.join(tmp_dir, f'{base}_cut.txt'),
+                                                output, durations)
+    for piece in pieces:
+        if os.path.exists(piece):
+            os.remove(piece)
+    return ok
@@ -0,0 +1,89 @@
+"""Overlay labels pre-rasterized to RGBA sprites.
+
+drawtext shapes and renders its text again on every frame it is enabled.
+rasterize() draws a label once, with the same drawtext options on a
+transparent canvas the size of the video, crops it to its visible bounds
+and caches the PNG by (text, font, style, canvas size). sprite_filters()
+composites the sprites with timed overlays, so the per-frame cost is one
+small alpha blend per visible label.
+"""
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from shorts.cache import (atomic_write_text, cache_key, cache_path, is_cached, load_meta,
+                          save_meta, tmp_name)
+from shorts.overlays import drawtext_options, filter_path
+from shorts.proc import run_sync
+
+SPRITE_VERSION = 1
+SPRITE_WORKERS = 8
+
+Sprite = namedtuple('Sprite', ['path', 'x', 'y', 'start', 'end'])
+
+_BBOX = re.compile(r'x1:(\d+) x2:(\d+) y1:(\d+) y2:(\d+)')
+
+
+def _ffmpeg(args):
+    r = run_sync(['ffmpeg', '-y', '-hide_banner'] + args)
+    if r.returncode != 0:
+        raise RuntimeError(f'sprite rasterization failed: {r.stderr[-300:]}')
+    return r.stderr
+
+
+def rasterize(text, style, fontfile, size):
+    """(png path, x, y) of the label drawn on a width x height canvas, cropped."""
+    key = cache_key(SPRITE_VERSION, text, style, fontfile, list(size))
+    path = cache_path('sprite', key, '.png')
+    meta = load_meta('sprite', key)
+    if meta is not None and is_cached(path):
+        return path, meta['x'], meta['y']
+
+    w, h = size
+    textfile = atomic_write_text(cache_path('sprite', key, '.txt'), text)
+    full = tmp_name(path, '.full.png')
+    _ffmpeg(['-f', 'lavfi', '-i', f'color=c=black@0.0:s={w}x{h},format=rgba',
+             '-vf', drawtext_options(style, fontfile, filter_path(textfile)),
+             '-frames:v', '1', full])
+    # 알파 채널 기준으로 보이는 영역만 잘라냄
+    log = _ffmpeg(['-i', full, '-vf', 'alphaextract,bbox', '-f', 'null', '-'])
+    m = _BBOX.findall(log)
+    if not m:
+        raise RuntimeError(f'empty sprite for {text!r}')
+    x1, x2, y1, y2 = map(int, m[-1])
+    tmp = tmp_name(path, '.png')
+    _ffmpeg(['-i', full, '-vf', f'crop={x2 - x1 + 1}:{y2 - y1 + 1}:{x1}:{y1}', tmp])
+    os.remove(full)
+    os.replace(tmp, path)
+    save_meta('sprite', key, {'x': x1, 'y': y1})
+    return path, x1, y1
+
+
+def rasterize_layers(layers, fonts, styles, size, workers=SPRITE_WORKERS):
+    """Sprites for layers (cached; misses are drawn concurrently)."""
+    def one(label):
+        text, style_name = label
+        style = styles[style_name]
+        return rasterize(text, style, fonts[style['font']], size)
+
+    labels = list(dict.fromkeys((layer.text, layer.style) for layer in layers))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(labels)))) as pool:
+        drawn = dict(zip(labels, pool.map(one, labels)))
+    return [Sprite(*drawn[(layer.text, layer.style)], layer.start, layer.end)
+            for layer in layers]
+
+
+def sprite_filters(v_in, v_out, sprites, head=(), tail=()):
+    """Chains overlaying each sprite during [start, end] between head and tail filters."""
+    chains, cur = [], v_in
+    if head:
+        chains.append(f"[{v_in}]" + ",".join(head) + "[sphead]")
+        cur = 'sphead'
+    for i, sp in enumerate(sprites):
+        chains.append(f"movie='{filter_path(sp.path)}',format=rgba[sp{i}]")
+        chains.append(f"[{cur}][sp{i}]overlay={sp.x}:{sp.y}"
+                      f":enable='between(t,{sp.start:.2f},{sp.end:.2f})'[spo{i}]")
+        cur = f'spo{i}'
+    chains.append(f"[{cur}]" + (",".join(tail) or "null") + f"[{v_out}]")
+    return chains
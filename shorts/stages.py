@@ -0,0 +1,64 @@
+"""Incremental rebuilds: render stages keyed by a hash of their inputs.
+
+A job renders as a small DAG of stages
+
+    TTS (per line) ─> audio mix ──┐
+    base (speed + filler) ─> video (text overlays) ──┴─> mux -> output
+
+Each stage's output lives in the shared cache under a key hashed from its
+input keys / file contents and its parameters (filter graph, encoder
+settings), so a rerun only rebuilds what changed: a typo in one label
+re-runs the video stage and the mux, a changed narration line only its
+TTS, the audio mix and the mux. Intermediates are kept in the cache
+instead of being deleted after each run.
+"""
+import os
+
+from shorts.cache import cache_key, cache_path, is_cached, load_meta, save_meta, tmp_name
+from shorts.workspace import publish_output
+
+
+async def run_stage(kind, key, ext, build, label):
+    """Cached output path of a stage, awaiting build(tmp_path) -> bool on a miss."""
+    path = cache_path(kind, key, ext)
+    if is_cached(path):
+        print(f'  [{label}] up to date')
+        return path
+    print(f'  [{label}] building...')
+    tmp = tmp_name(path, ext)  # 같은 키를 동시에 빌드해도 충돌 없음
+    if not await build(tmp):
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    os.replace(tmp, path)
+    return path
+
+
+def _publish_key(output):
+    return cache_key('publish', os.path.abspath(output))
+
+
+def is_published(output, key):
+    """True if output exists and was last written from the stage key given."""
+    meta = load_meta('publish', _publish_key(output))
+    if meta is None or meta.get('key') != key or not os.path.exists(output):
+        return False
+    st = os.stat(output)
+    return meta.get('size') == st.st_size and meta.get('mtime_ns') == st.st_mtime_ns
+
+
+async def publish(output, key, build, label):
+    """Write output with await build(path) -> bool unless it is already current.
+
+    build writes a temporary file that replaces output only on success.
+    """
+    if is_published(output, key):
+        print(f'  [{label}] {output} up to date')
+        return True
+    print(f'  [{label}] writing {output}...')
+    if not await publish_output(output, build):
+        return False
+    st = os.stat(output)
+    save_meta('publish', _publish_key(output),
+              {'key': key, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns})
+    return True
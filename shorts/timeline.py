@@ -0,0 +1,118 @@
+"""Piecewise-linear map between source time and output time.
+
+A Timeline is a list of pieces laid end to end on the output timeline.
+Each piece plays the source from `src` at `rate` source seconds per output
+second: rate 1 is normal play, 2 is double speed, 0 holds (freezes) the
+frame at `src`. Source ranges no piece covers are cut.
+
+Lookups bisect the piece starts (O(log n) per timestamp); output()/source()
+map one time, outputs()/sources() map a whole array at once with NumPy
+when it is installed. then() composes two timelines, e.g. a speed edit
+followed by holds inserted into its output.
+"""
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성
+    np = None
+
+# out: 출력 시작, src: 원본 시작, duration: 출력 길이, rate: 원본 초 / 출력 초 (0 = 정지)
+Piece = namedtuple('Piece', ['out', 'src', 'duration', 'rate'])
+
+
+class Timeline:
+    def __init__(self, pieces):
+        self.pieces = [Piece(*p) for p in pieces if p[2] > 0]
+        self._out = [p.out for p in self.pieces]
+        self.duration = self.pieces[-1].out + self.pieces[-1].duration if self.pieces else 0.0
+        # 원본 → 출력 방향은 재생되는 조각만, 원본 시작 순으로
+        self._fwd = sorted((p for p in self.pieces if p.rate > 0), key=lambda p: p.src)
+        self._fwd_src = [p.src for p in self._fwd]
+
+    @classmethod
+    def identity(cls, duration):
+        return cls([(0.0, 0.0, duration, 1.0)])
+
+    @classmethod
+    def from_segments(cls, segments, orig_dur):
+        """Speed edit: [(start, end, speed)] source ranges (end None = orig_dur), in order."""
+        if not segments:
+            return cls.identity(orig_dur)
+        pieces, t = [], 0.0
+        for start, end, speed in segments:
+            seg_end = end if end is not None else orig_dur
+            dur = (seg_end - start) / speed
+            pieces.append((t, start, dur, speed))
+            t += dur
+        return cls(pieces)
+
+    @classmethod
+    def from_holds(cls, holds):
+        """Frame holds: [(source time, seconds)] frozen one after another."""
+        pieces, t = [], 0.0
+        for src_t, seconds in holds:
+            pieces.append((t, src_t, seconds, 0.0))
+            t += seconds
+        return cls(pieces)
+
+    def __len__(self):
+        return len(self.pieces)
+
+    def _piece_at(self, t):
+        return min(max(bisect_right(self._out, t) - 1, 0), len(self.pieces) - 1)
+
+    def output(self, t):
+        """Output time at which source time t plays.
+
+        A time inside a cut maps to where the next kept range starts; times
+        past the last range map to the end.
+        """
+        i = bisect_right(self._fwd_src, t) - 1
+        if i < 0:
+            return self._fwd[0].out if self._fwd else 0.0
+        p = self._fwd[i]
+        return p.out + min((t - p.src) / p.rate, p.duration)
+
+    def source(self, t):
+        """Source time shown at output time t (clamped to the timeline)."""
+        p = self.pieces[self._piece_at(t)]
+        return p.src + min(max(t - p.out, 0.0), p.duration) * p.rate
+
+    def outputs(self, ts):
+        """output() of every time in ts (a NumPy array when NumPy is available)."""
+        if np is None or not self._fwd:
+            return [self.output(t) for t in ts]
+        ts = np.asarray(ts, dtype=np.float64)
+        out, src, dur, rate = (np.array(c, dtype=np.float64) for c in zip(*self._fwd))
+        i = np.searchsorted(src, ts, side='right') - 1
+        before = i < 0
+        i = np.maximum(i, 0)
+        res = out[i] + np.minimum((ts - src[i]) / rate[i], dur[i])
+        return np.where(before, out[0], res)
+
+    def sources(self, ts):
+        """source() of every time in ts (a NumPy array when NumPy is available)."""
+        if np is None:
+            return [self.source(t) for t in ts]
+        ts = np.asarray(ts, dtype=np.float64)
+        out, src, dur, rate = (np.array(c, dtype=np.float64) for c in zip(*self.pieces))
+        i = np.clip(np.searchsorted(out, ts, side='right') - 1, 0, len(self.pieces) - 1)
+        return src[i] + np.clip(ts - out[i], 0.0, dur[i]) * rate[i]
+
+    def then(self, other):
+        """Timeline of self followed by other (other's source is self's output)."""
+        pieces = []
+        for o0, m0, d, rate in other.pieces:
+            if rate == 0:
+                pieces.append((o0, self.source(m0), d, 0.0))
+                continue
+            m1 = m0 + d * rate
+            cuts = ([m0] + self._out[bisect_right(self._out, m0):bisect_left(self._out, m1)]
+                    + [m1])
+            for a, b in zip(cuts, cuts[1:]):
+                p = self.pieces[self._piece_at(a)]
+                pieces.append((o0 + (a - m0) / rate, self.source(a), (b - a) / rate,
+                               rate * p.rate))
+        return Timeline(pieces)
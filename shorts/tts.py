@@ -0,0 +1,61 @@
+"""Narration synthesis with edge-tts.
+
+All lines of a job are requested concurrently, at most DEFAULT_CONCURRENCY
+(6) at a time, so a 13-segment short pays about three sequential network
+round-trips (ceil(13 / 6)) instead of 13.
+Audio and its measured duration are cached by (text, voice, rate, edge-tts
+version), so re-runs and other scripts with identical lines skip both the
+TTS request and the ffprobe call.
+"""
+import asyncio
+import os
+from collections import namedtuple
+from importlib import metadata
+
+import edge_tts
+
+from shorts.cache import cache_key, fetch_file, load_meta, save_meta, store_file
+from shorts.probe import get_duration
+
+# 동시에 진행할 TTS 요청 수 (edge-tts 서버 부하 고려)
+DEFAULT_CONCURRENCY = 6
+
+# 한 줄의 나레이션: 텍스트, 출력 파일, 음성, 속도
+TtsLine = namedtuple('TtsLine', ['text', 'outfile', 'voice', 'rate'])
+TtsResult = namedtuple('TtsResult', ['outfile', 'duration', 'cached'])
+
+try:
+    BACKEND_VERSION = 'edge-tts ' + metadata.version('edge-tts')
+except metadata.PackageNotFoundError:
+    BACKEND_VERSION = 'edge-tts'
+
+
+def line_key(line):
+    """Cache key of a TtsLine; the output path does not take part."""
+    return cache_key(line.text, line.voice, line.rate, BACKEND_VERSION)
+
+
+async def _synthesize_one(line, sem):
+    key = line_key(line)
+    meta = load_meta('tts', key)
+    if meta is not None and fetch_file('tts', key, '.mp3', line.outfile):
+        return TtsResult(line.outfile, meta['duration'], True)
+
+    async with sem:
+        communicate = edge_tts.Communicate(line.text, line.voice, rate=line.rate)
+        await communicate.save(line.outfile)
+    dur = get_duration(line.outfile)
+    store_file('tts', key, '.mp3', line.outfile)
+    save_meta('tts', key, {'text': line.text, 'voice': line.voice, 'rate': line.rate,
+                           'backend': BACKEND_VERSION, 'duration': dur})
+    return TtsResult(line.outfile, dur, False)
+
+
+async def synthesize_all(lines, concurrency=DEFAULT_CONCURRENCY):
+    """Synthesize every TtsLine concurrently; returns TtsResults in input order."""
+    for line in lines:
+        d = os.path.dirname(line.outfile)
+        if d:
+            os.makedirs(d, exist_ok=True)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    return await asyncio.gather(*(_synthesize_one(line, sem) for line in lines))
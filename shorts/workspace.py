@@ -0,0 +1,98 @@
+"""Per-job scratch directories and atomic publishing of final outputs.
+
+Intermediates (filter scripts, hold lists, narration clips, mix stems,
+smart-cut pieces) go into a Workspace: a directory unique to one run of
+one job, so concurrent runs never write each other's files, removed when
+the job ends whether it succeeded, failed or was interrupted. Files
+expected to stay under SHM_LIMIT are put on /dev/shm when it exists, so
+small intermediates never touch the disk; larger ones (or all of them
+with SHORTS_SHM=0) go under SCRATCH_DIR. SHORTS_KEEP_SCRATCH=1 keeps the
+directories for debugging.
+
+publish_output() writes a final output under a temporary name next to it
+and renames it into place only on success: nobody sees a half-written
+file and a failed run leaves the previous output as it was.
+"""
+import os
+import shutil
+import tempfile
+
+from shorts.cache import tmp_name
+
+SCRATCH_DIR = os.environ.get('SHORTS_SCRATCH_DIR', '.shorts_scratch')
+SHM_DIR = '/dev/shm'
+SHM_ENV = 'SHORTS_SHM'
+KEEP_ENV = 'SHORTS_KEEP_SCRATCH'
+# 이보다 큰 중간 파일은 디스크로, tmpfs에는 항상 이만큼 여유를 남김
+SHM_LIMIT = int(os.environ.get('SHORTS_SHM_LIMIT_MB', 256)) << 20
+SHM_RESERVE = 512 << 20
+
+
+def shm_available():
+    return (os.environ.get(SHM_ENV, '1') != '0' and os.path.isdir(SHM_DIR)
+            and os.access(SHM_DIR, os.W_OK))
+
+
+class Workspace:
+    """Scratch directory of one job run; use as a context manager."""
+
+    def __init__(self, name):
+        self.name = name
+        self._dirs = {}
+
+    def _dir(self, shm):
+        if shm not in self._dirs:
+            root = os.path.join(SHM_DIR, 'shorts') if shm else SCRATCH_DIR
+            os.makedirs(root, exist_ok=True)
+            self._dirs[shm] = tempfile.mkdtemp(prefix=f'{self.name}.', dir=root)
+        return self._dirs[shm]
+
+    def _fits_shm(self, size):
+        if size > SHM_LIMIT or not shm_available():
+            return False
+        return shutil.disk_usage(SHM_DIR).free - size > SHM_RESERVE
+
+    def path(self, filename, size=0):
+        """Path for an intermediate of about size bytes."""
+        return os.path.join(self._dir(self._fits_shm(size)), filename)
+
+    def cleanup(self):
+        if os.environ.get(KEEP_ENV):
+            for d in self._dirs.values():
+                print(f'  [{self.name}] scratch kept: {d}')
+        else:
+            for d in self._dirs.values():
+                shutil.rmtree(d, ignore_errors=True)
+        self._dirs.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+
+def tmp_output(output):
+    """Temporary name next to output (same filesystem, same extension for ffmpeg)."""
+    root, ext = os.path.splitext(output)
+    return tmp_name(root, f'.tmp{ext}')
+
+
+def commit_output(tmp, output, ok):
+    """Move tmp into place as output if ok, else delete it; returns ok."""
+    if ok:
+        os.replace(tmp, output)
+    elif os.path.exists(tmp):
+        os.remove(tmp)
+    return ok
+
+
+async def publish_output(output, build):
+    """Write output atomically with await build(tmp_path) -> bool."""
+    tmp = tmp_output(output)
+    try:
+        ok = await build(tmp)
+    except BaseException:
+        commit_output(tmp, output, False)
+        raise
+    return commit_output(tmp, output, ok)
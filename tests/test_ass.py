@@ -0,0 +1,45 @@
+from shorts.ass import ass_color, ass_time, compile_ass, eval_position
+from shorts.overlays import Layer, resolve_styles
+
+# 없는 폰트 파일: 파일 이름이 family, 크기 배율 1
+FONTS = {'bold': 'C\\:/Windows/Fonts/malgunbd.ttf', 'regular': 'C\\:/Windows/Fonts/malgun.ttf'}
+SIZE = (720, 1280)
+
+
+def events(script):
+    return [line for line in script.splitlines() if line.startswith('Dialogue:')]
+
+
+def test_script_header_and_used_styles_only():
+    script = compile_ass([Layer('hi', 'subtitle', 0.0, 1.0)], FONTS, resolve_styles(), SIZE)
+    assert 'PlayResX: 720\nPlayResY: 1280' in script
+    styles = [line.split(',')[0] for line in script.splitlines() if line.startswith('Style:')]
+    assert styles == ['Style: subtitle', 'Style: subtitle_box']
+    assert 'Style: subtitle,malgunbd,44.0,&H00FFFFFF' in script
+
+
+def test_box_and_text_events_share_position_and_timing():
+    script = compile_ass([Layer('hi', 'subtitle', 1.234, 5.001)], FONTS, resolve_styles(), SIZE)
+    box, text = events(script)
+    assert box == 'Dialogue: 0,0:00:01.23,0:00:05.01,subtitle_box,,0,0,0,,{\\an8\\pos(360,1126)}hi'
+    assert text == 'Dialogue: 1,0:00:01.23,0:00:05.01,subtitle,,0,0,0,,{\\an8\\pos(360,1126)}hi'
+
+
+def test_multi_line_text_height_counts_every_line():
+    # h-text_h-110: 두 줄이면 블록 전체가 아래에서 110px 위에서 끝남
+    script = compile_ass([Layer('one\ntwo', 'subtitle', 0.0, 1.0)], FONTS, resolve_styles(),
+                         SIZE)
+    assert events(script)[1].endswith('{\\an8\\pos(360,1082)}one\\Ntwo')
+
+
+def test_left_aligned_style_and_escaped_text():
+    styles = resolve_styles({'subtitle': {'x': '40', 'y': '8'}})
+    script = compile_ass([Layer('{x}', 'subtitle', 0.0, 1.0)], FONTS, styles, SIZE)
+    assert events(script)[1].endswith('{\\an7\\pos(40,8)}\\{x\\}')
+
+
+def test_helpers():
+    assert ass_time(3725.456) == '1:02:05.46'
+    assert ass_color('#FFD700') == '&H0000D7FF'
+    assert ass_color('black@0.6') == '&H66000000'
+    assert eval_position('(h-text_h)/2-110', h=1920, text_h=100) == 800
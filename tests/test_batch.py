@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from shorts.batch import ENCODE_MEMORY, MAX_ENCODES, Budget, allocate, ffmpeg_threads, naive
+
+GB = 1 << 30
+
+
+def test_single_task_gets_the_whole_machine():
+    assert allocate(1, cores=16, memory=64 * GB) == Budget(1, 2, 8, 4, 16, 64 * GB)
+
+
+def test_large_batch_gets_narrow_workers():
+    assert allocate(20, cores=16, memory=64 * GB) == Budget(8, 1, 2, 1, 16, 64 * GB)
+
+
+def test_memory_limits_concurrent_encodes():
+    budget = allocate(20, cores=16, memory=3 * GB)
+    assert budget.workers * budget.encodes == 3
+    assert budget.threads == 5
+
+
+def test_requested_workers_are_kept():
+    assert allocate(10, workers=2, cores=8, memory=64 * GB)[:3] == (2, 2, 2)
+    assert allocate(1, workers=4, cores=8, memory=64 * GB).workers == 1
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_budget_stays_within_cores_and_memory(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        cores, memory = rng.randint(2, 128), rng.randint(1, 256) * GB
+        budget = allocate(rng.randint(1, 64), cores=cores, memory=memory)
+        encodes = budget.workers * budget.encodes
+        assert 1 <= budget.encodes <= MAX_ENCODES
+        assert encodes * budget.threads <= cores
+        assert encodes * ENCODE_MEMORY <= max(memory, ENCODE_MEMORY)
+        assert 1 <= budget.filter_threads <= budget.threads
+
+
+def test_naive_leaves_threads_to_ffmpeg():
+    budget = naive(3, cores=8, memory=GB)
+    assert (budget.workers, budget.threads, budget.filter_threads) == (3, 0, 0)
+
+
+def test_ffmpeg_threads_follow_the_worker_share(monkeypatch):
+    monkeypatch.setenv('SHORTS_FFMPEG_THREADS', '4')
+    monkeypatch.setenv('SHORTS_FILTER_THREADS', '2')
+    monkeypatch.setenv('SHORTS_ENCODE_SLOTS', '2')
+    assert ffmpeg_threads() == ['-threads', '4', '-filter_threads', '2',
+                                '-filter_complex_threads', '2']
+    monkeypatch.setenv('SHORTS_FFMPEG_THREADS', '')
+    assert ffmpeg_threads() == []
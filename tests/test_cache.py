@@ -0,0 +1,37 @@
+import os
+
+from shorts import cache
+
+
+def _entry(kind, key, size, used_ns):
+    path = cache.cache_path(kind, key, '.bin')
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    os.utime(path, ns=(used_ns, used_ns))
+    return path
+
+
+def test_prune_drops_least_recently_used_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path))
+    old = _entry('stage', 'aa01', 100, 1_000_000_000)
+    mid = _entry('stage', 'bb02', 100, 2_000_000_000)
+    new = _entry('stage', 'cc03', 100, 3_000_000_000)
+    assert cache.prune(limit=200) == 100
+    assert not os.path.exists(old)
+    assert os.path.exists(mid) and os.path.exists(new)
+
+
+def test_hit_protects_entry_from_prune(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path))
+    old = _entry('stage', 'aa01', 100, 1_000_000_000)
+    new = _entry('stage', 'bb02', 100, 2_000_000_000)
+    assert cache.is_cached(old)
+    cache.prune(limit=100)
+    assert os.path.exists(old) and not os.path.exists(new)
+
+
+def test_prune_without_limit_keeps_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path))
+    path = _entry('stage', 'aa01', 100, 1_000_000_000)
+    assert cache.prune(limit=0) == 0
+    assert os.path.exists(path)
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from shorts.dag import Dag
+
+
+def _run(dag):
+    return asyncio.run(dag.run())
+
+
+def test_nodes_get_their_dependencies_results():
+    order = []
+
+    def node(name, value):
+        async def fn(*args):
+            order.append(name)
+            return value(*args)
+        return fn
+
+    dag = Dag(cpu=2)
+    dag.add('a', node('a', lambda: 1))
+    dag.add('b', node('b', lambda: 2))
+    dag.add('c', node('c', lambda a, b: a + b), ['a', 'b'])
+    dag.add('d', node('d', lambda c: c * 10), ['c'])
+    assert _run(dag) == {'a': 1, 'b': 2, 'c': 3, 'd': 30}
+    assert order.index('c') > max(order.index('a'), order.index('b'))
+    assert order[-1] == 'd'
+
+
+def test_failure_propagates_to_dependents_only():
+    async def bad():
+        raise RuntimeError('render failed')
+
+    async def ok(*args):
+        return 'done'
+
+    dag = Dag(cpu=2)
+    dag.add('bad', bad)
+    dag.add('c', ok, ['bad'])
+    dag.add('d', ok, ['c'])
+    dag.add('other', ok)
+    dag.add('after', ok, ['other'])
+    results = _run(dag)
+    # c, d는 bad의 예외를 그대로 받고, 독립된 갈래는 끝까지 실행
+    assert isinstance(results['bad'], RuntimeError)
+    assert results['c'] is results['bad'] and results['d'] is results['bad']
+    assert results['other'] == 'done' and results['after'] == 'done'
+
+
+@pytest.mark.parametrize('pool, limit', [('cpu', 2), ('net', 3)])
+def test_pools_limit_concurrency(pool, limit):
+    running, peak = {'cpu': 0, 'net': 0}, {'cpu': 0, 'net': 0}
+
+    def node(p):
+        async def fn():
+            running[p] += 1
+            peak[p] = max(peak[p], running[p])
+            await asyncio.sleep(0.01)
+            running[p] -= 1
+        return fn
+
+    dag = Dag(cpu=2, net=3)
+    for i in range(8):
+        dag.add(f'{pool}{i}', node(pool), pool=pool)
+    # 다른 풀의 작업은 이 풀의 자리를 차지하지 않음
+    other = 'net' if pool == 'cpu' else 'cpu'
+    dag.add(other, node(other), pool=other)
+    _run(dag)
+    assert peak[pool] == limit
+    assert peak[other] == 1
+
+
+def test_unpooled_nodes_are_not_limited():
+    running, peak = [0], [0]
+
+    async def fn():
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+
+    dag = Dag(cpu=1, net=1)
+    for i in range(5):
+        dag.add(f'n{i}', fn, pool=None)
+    _run(dag)
+    assert peak[0] == 5
+
+
+def test_add_rejects_unknown_dependencies_and_pools():
+    dag = Dag(cpu=1)
+    dag.add('a', lambda: None)
+    with pytest.raises(ValueError):
+        dag.add('a', lambda: None)
+    with pytest.raises(ValueError):
+        dag.add('b', lambda: None, ['missing'])
+    with pytest.raises(ValueError):
+        dag.add('c', lambda: None, pool='gpu')
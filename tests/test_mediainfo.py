@@ -0,0 +1,89 @@
+import struct
+
+import pytest
+
+from shorts.mediainfo import mp3_duration, mp4_duration, read_duration
+
+# MPEG1 Layer III, 128 kbps, 44100 Hz, 패딩 없음: 프레임 417바이트, 1152 샘플
+STEREO = bytes([0xFF, 0xFB, 0x90, 0x00])
+MONO = bytes([0xFF, 0xFB, 0x90, 0xC0])
+FRAME_LEN = 417
+
+
+def frame(header=STEREO, body=b''):
+    return (header + body).ljust(FRAME_LEN, b'\0')
+
+
+def id3v2(size):
+    syncsafe = bytes([(size >> s) & 0x7F for s in (21, 14, 7, 0)])
+    return b'ID3\x03\x00\x00' + syncsafe + b'\0' * size
+
+
+def box(kind, body):
+    return struct.pack('>I4s', 8 + len(body), kind) + body
+
+
+def mvhd(timescale, duration, version=0):
+    if version == 1:
+        return box(b'mvhd', bytes([1, 0, 0, 0]) + struct.pack('>QQIQ', 0, 0, timescale, duration))
+    return box(b'mvhd', bytes(4) + struct.pack('>IIII', 0, 0, timescale, duration))
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_mp3_cbr_counts_frames(tmp_path):
+    path = write(tmp_path, 'cbr.mp3', frame() * 100)
+    assert mp3_duration(path) == pytest.approx(100 * 1152 / 44100)
+
+
+def test_mp3_skips_id3v2_and_id3v1(tmp_path):
+    data = id3v2(300) + frame() * 50 + b'TAG' + b'\0' * 125
+    assert mp3_duration(write(tmp_path, 'tagged.mp3', data)) == pytest.approx(50 * 1152 / 44100)
+
+
+def test_mp3_xing_header_gives_frame_count(tmp_path):
+    # 스테레오 MPEG1: side info 32바이트 뒤에 Xing, flags=1 이면 프레임 수
+    xing = b'\0' * 32 + b'Xing' + struct.pack('>II', 1, 1000)
+    data = frame(body=xing) + frame() * 10
+    assert mp3_duration(write(tmp_path, 'vbr.mp3', data)) == pytest.approx(1000 * 1152 / 44100)
+
+
+def test_mp3_info_header_in_mono(tmp_path):
+    info = b'\0' * 17 + b'Info' + struct.pack('>II', 1, 250)
+    data = frame(MONO, info) + frame(MONO) * 10
+    assert mp3_duration(write(tmp_path, 'mono.mp3', data)) == pytest.approx(250 * 1152 / 44100)
+
+
+def test_mp3_without_frames(tmp_path):
+    assert mp3_duration(write(tmp_path, 'junk.mp3', b'not an mp3 at all')) is None
+
+
+@pytest.mark.parametrize('version', [0, 1])
+def test_mp4_reads_mvhd(tmp_path, version):
+    data = (box(b'ftyp', b'isom\0\0\0\0') + box(b'mdat', b'\0' * 64)
+            + box(b'moov', box(b'trak', b'') + mvhd(1000, 12345, version)))
+    assert mp4_duration(write(tmp_path, 'clip.mp4', data)) == pytest.approx(12.345)
+
+
+def test_mp4_without_moov(tmp_path):
+    assert mp4_duration(write(tmp_path, 'bare.mp4', box(b'ftyp', b'isom\0\0\0\0'))) is None
+
+
+def test_mp4_zero_duration_is_unknown(tmp_path):
+    # 조각난(fragmented) mp4는 mvhd 길이가 0: ffprobe로 넘겨야 함
+    data = box(b'moov', mvhd(1000, 0)) + box(b'moof', b'') + box(b'mdat', b'\0' * 64)
+    assert mp4_duration(write(tmp_path, 'frag.mp4', data)) is None
+
+
+def test_read_duration_dispatches_by_extension(tmp_path):
+    m4a = write(tmp_path, 'voice.M4A', box(b'moov', mvhd(44100, 88200)))
+    assert read_duration(m4a) == pytest.approx(2.0)
+    assert read_duration(write(tmp_path, 'frame.png', b'\x89PNG')) is None
+
+
+def test_read_duration_unparseable_is_none(tmp_path):
+    assert read_duration(write(tmp_path, 'broken.mp4', box(b'moov', b'mvhd'))) is None
@@ -0,0 +1,151 @@
+import shutil
+import subprocess
+
+import pytest
+
+from shorts import cache
+from shorts.smartcut import (_piece_command, edge_video_args, gop_index, plan_cut, plan_pieces,
+                             smart_cut)
+
+FPS = 30
+# 30fps, 키프레임 0, 61, 122, 183번 프레임 (ffprobe pts_time 형식, 소수 6자리)
+PTS = [round(n / FPS, 6) for n in range(240)]
+KEYFRAMES = [PTS[n] for n in (0, 61, 122, 183)]
+INDEX = {'pts': PTS, 'keyframes': KEYFRAMES, 'packets': [0, 61, 122, 183], 'total': 240}
+DURATION = 8.0
+STREAM = {'codec_name': 'h264', 'profile': 'Main', 'level': 31, 'pix_fmt': 'yuv420p'}
+
+
+def test_plan_cut_copies_between_keyframes():
+    assert plan_cut(KEYFRAMES, 1.0, 5.0, DURATION) == [
+        ('encode', 1.0, 2.033333), ('copy', 2.033333, 4.066667), ('encode', 4.066667, 5.0)]
+
+
+def test_plan_cut_copies_to_end_of_file():
+    assert plan_cut(KEYFRAMES, 4.066667, None, DURATION) == [('copy', 4.066667, DURATION)]
+
+
+def test_plan_cut_without_keyframe_in_range_encodes():
+    assert plan_cut(KEYFRAMES, 2.5, 3.5, DURATION) == [('encode', 2.5, 3.5)]
+    assert plan_cut([], 1.0, 5.0, DURATION) == [('encode', 1.0, 5.0)]
+
+
+def test_copy_piece_holds_packets_up_to_next_keyframe():
+    pieces = plan_pieces(INDEX, 2.033333, 6.1, DURATION)
+    assert [(mode, seek, frames) for mode, seek, frames, _ in pieces] == [
+        ('copy', 2.033333, 122)]
+    pieces = plan_pieces(INDEX, 6.1, None, DURATION)
+    assert pieces[0][2] == 240 - 183
+
+
+def test_leading_edge_holds_the_frames_before_the_keyframe():
+    (mode, seek, frames, seconds), copy = plan_pieces(INDEX, 1.0, 4.066667, DURATION)[:2]
+    # 30번(1.0s)부터 60번 프레임까지, 61번 키프레임은 복사 조각에
+    assert (mode, seek, frames) == ('encode', 1.0, 31)
+    assert abs(seconds - 1.033333) < 1e-9
+    assert copy[:3] == ('copy', 2.033333, 61)
+
+
+def test_edge_frames_follow_variable_frame_rate():
+    # 처음 3초는 30fps, 그 뒤는 10fps
+    pts = [round(n / 30, 6) for n in range(90)] + [round(3 + n / 10, 6) for n in range(50)]
+    index = {'pts': pts, 'keyframes': [0.0, 4.0], 'packets': [0, 100], 'total': 140}
+    mode, seek, frames, _ = plan_pieces(index, 2.0, 8.0, 8.0)[0]
+    assert (mode, seek, frames) == ('encode', 2.0, 30 + 10)
+
+
+def test_edges_between_frames_snap_to_frame_timestamps():
+    lead, copy, trail = plan_pieces(INDEX, 1.01, 5.02, DURATION)
+    # 31번(1.033333s) 프레임부터, 끝은 다음 구간과 겹치지 않게 151번 프레임 시각까지
+    assert lead[:3] == ('encode', 1.033333, 30)
+    assert abs(lead[3] - 1.0) < 1e-9
+    assert trail[:3] == ('encode', 4.066667, 29)
+    assert abs(trail[3] - (5.033333 - 4.066667)) < 1e-9
+
+
+def test_trailing_edge_starts_on_keyframe():
+    mode, seek, frames, seconds = plan_pieces(INDEX, 2.033333, 5.0, DURATION)[-1]
+    assert (mode, seek, frames) == ('encode', 4.066667, 28)
+
+
+def test_copy_command_seeks_to_exact_keyframe_and_counts_frames():
+    cmd = _piece_command('in.mp4', 'copy', 2.033333, 61, 61 / FPS, 'out.mkv',
+                         edge_video_args(STREAM), ['-c:a', 'pcm_s16le'])
+    assert cmd[cmd.index('-ss') + 1] == '2.033333'
+    assert cmd[cmd.index('-frames:v') + 1] == '61'
+    assert cmd[cmd.index('-c:v') + 1] == 'copy'
+    assert '-t' not in cmd
+    assert cmd[cmd.index('-af') + 1] == 'atrim=end=2.033333'
+    assert cmd[-1] == 'out.mkv'
+
+
+def test_encode_command_matches_source_and_keeps_timestamps():
+    cmd = _piece_command('in.mp4', 'encode', 1.0, 31, 31 / FPS, 'out.mkv',
+                         edge_video_args(STREAM), [])
+    assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+    assert cmd[cmd.index('-profile:v') + 1] == 'main'
+    assert cmd[cmd.index('-level:v') + 1] == '3.1'
+    assert cmd[cmd.index('-fps_mode') + 1] == 'passthrough'
+    assert '-r' not in cmd
+
+
+def test_no_audio_filter_without_audio_stream():
+    cmd = _piece_command('in.mp4', 'copy', 0.0, 61, 61 / FPS, 'out.mkv',
+                         edge_video_args(STREAM), ['-c:a', 'pcm_s16le'], has_audio=False)
+    assert '-af' not in cmd and 'pcm_s16le' not in cmd
+
+
+needs_ffmpeg = pytest.mark.skipif(not (shutil.which('ffmpeg') and shutil.which('ffprobe')),
+                                  reason='needs ffmpeg and ffprobe')
+
+
+def _ffmpeg(*args):
+    subprocess.run(['ffmpeg', '-v', 'error', '-y'] + list(args), check=True)
+
+
+def _decode_errors(path):
+    r = subprocess.run(['ffmpeg', '-v', 'error', '-i', path, '-f', 'null', '-'],
+                       capture_output=True, text=True)
+    return r.returncode, r.stderr.strip()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize('ranges', [[(1.0, 5.0), (6.5, None)], [(1.01, 5.02), (6.5, None)]])
+def test_smart_cut_of_real_clip_decodes_cleanly(workdir, ranges):
+    src = str(workdir / 'src.mp4')
+    _ffmpeg('-f', 'lavfi', '-i', 'testsrc2=size=320x240:rate=30', '-f', 'lavfi', '-i',
+            'sine=sample_rate=48000', '-t', '8', '-c:v', 'libx264', '-profile:v', 'high',
+            '-g', '60', '-sc_threshold', '0', '-bf', '2', '-pix_fmt', 'yuv420p', '-c:a', 'aac',
+            '-shortest', src)
+    out = str(workdir / 'cut.mkv')
+    assert smart_cut(src, ranges, out, str(workdir / 'pieces'),
+                     ['-c:a', 'pcm_s16le'])
+    assert _decode_errors(out) == (0, '')
+    # 1.0~5.0초 120프레임 + 6.5초~끝 45프레임, 가운데 GOP는 복사
+    # (프레임 사이에서 시작/끝나는 구간도 같은 프레임)
+    assert gop_index(out)['total'] == 165
+
+
+@needs_ffmpeg
+def test_smart_cut_of_vfr_clip_without_audio(workdir):
+    src = str(workdir / 'vfr.mp4')
+    # 처음 100프레임은 30fps, 이후 20fps
+    _ffmpeg('-f', 'lavfi', '-i', "testsrc2=size=320x240:rate=30,"
+            "setpts='if(lt(N,100),N/30,(N-100)/20+100/30)/TB'", '-t', '8',
+            '-c:v', 'libx264', '-profile:v', 'main', '-g', '48', '-sc_threshold', '0',
+            '-fps_mode', 'vfr', '-an', src)
+    out = str(workdir / 'cut.mkv')
+    assert smart_cut(src, [(1.0, 5.0)], out, str(workdir / 'pieces'), ['-c:a', 'pcm_s16le'])
+    assert _decode_errors(out) == (0, '')
+    src_pts = [t for t in gop_index(src)['pts'] if 1.0 - 1e-6 <= t < 5.0 - 1e-6]
+    out_pts = gop_index(out)['pts']
+    assert len(out_pts) == len(src_pts)
+    # 프레임 간격이 원본 그대로 (mkv 타임베이스 1ms)
+    assert all(abs((b - a) - (d - c)) < 0.0015 for a, b, c, d in
+               zip(src_pts, src_pts[1:], out_pts, out_pts[1:]))
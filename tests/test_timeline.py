@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from shorts import timeline
+from shorts.timeline import Timeline
+
+
+def map_time(segments, orig_t, orig_dur):
+    """The per-timestamp scan Timeline replaced, kept as the reference."""
+    if not segments:
+        return orig_t
+    new_t = 0.0
+    for (start, end, speed) in segments:
+        seg_end = end if end is not None else orig_dur
+        if orig_t <= start:
+            return new_t
+        elif orig_t < seg_end:
+            return new_t + (orig_t - start) / speed
+        else:
+            new_t += (seg_end - start) / speed
+    return new_t
+
+
+def random_segments(rng, orig_dur):
+    """Ordered, non-overlapping [(start, end, speed)] with gaps; last end may be None."""
+    cuts = sorted(rng.uniform(0, orig_dur) for _ in range(2 * rng.randint(1, 8)))
+    segments = [(a, b, rng.choice([0.5, 1.0, 1.5, 2.0, 4.0, 8.0]))
+                for a, b in zip(cuts[::2], cuts[1::2]) if b > a]
+    if segments and rng.random() < 0.5:
+        start, _, speed = segments[-1]
+        segments[-1] = (start, None, speed)
+    return segments
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_output_matches_map_time(seed):
+    rng = random.Random(seed)
+    orig_dur = rng.uniform(10, 300)
+    segments = random_segments(rng, orig_dur)
+    tl = Timeline.from_segments(segments, orig_dur)
+    times = [rng.uniform(-1, orig_dur + 1) for _ in range(200)]
+    times += [t for s in segments for t in s[:2] if t is not None]
+    for t in times:
+        assert tl.output(t) == pytest.approx(map_time(segments, t, orig_dur), abs=1e-9)
+    expected = [map_time(segments, t, orig_dur) for t in times]
+    assert list(tl.outputs(times)) == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_outputs_without_numpy(seed, monkeypatch):
+    monkeypatch.setattr(timeline, 'np', None)
+    rng = random.Random(seed)
+    orig_dur = rng.uniform(10, 300)
+    segments = random_segments(rng, orig_dur)
+    times = [rng.uniform(0, orig_dur) for _ in range(50)]
+    assert Timeline.from_segments(segments, orig_dur).outputs(times) == pytest.approx(
+        [map_time(segments, t, orig_dur) for t in times], abs=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_source_inverts_output_inside_kept_ranges(seed):
+    rng = random.Random(seed)
+    orig_dur = rng.uniform(10, 300)
+    segments = random_segments(rng, orig_dur)
+    tl = Timeline.from_segments(segments, orig_dur)
+    for start, end, _ in segments:
+        t = rng.uniform(start, end if end is not None else orig_dur)
+        assert tl.source(tl.output(t)) == pytest.approx(t, abs=1e-9)
+
+
+def test_no_segments_is_identity():
+    tl = Timeline.from_segments([], 42.0)
+    assert tl.duration == 42.0
+    assert tl.output(12.5) == map_time([], 12.5, 42.0) == 12.5
+
+
+def test_holds_freeze_source_time():
+    tl = Timeline.from_holds([(3.0, 2.0), (7.5, 1.5)])
+    assert tl.duration == 3.5
+    assert tl.sources([0.0, 1.9, 2.0, 3.4]) == pytest.approx([3.0, 3.0, 7.5, 7.5])